@@ -15,16 +15,37 @@
 
 """A modern GUI library."""
 
-from .cmm import cquit, mainloop, manager
-from .const import *
+from .profiling import startup_timings
 
-# from .drawing import *
-from .event import Event, EventHandling, EventTask, WorkingThread
-from .object import CharmyObject
-from .pos import Pos
-from .rect import Rect
-from .size import Size
-from .frameworks import Frameworks
-from .styles import *
-from .var import BooleanVar, FloatVar, IntVar, StringVar, Var
-from .widgets import *
+with startup_timings.phase("import charmy"):
+    from .batch import RectBatch
+    from .cmm import async_mainloop, cquit, get_manager, mainloop
+    from .const import *
+
+    # from .drawing import *
+    from .event import (
+        Event,
+        EventHandling,
+        EventTask,
+        KeyEvent,
+        MouseEvent,
+        MoveEvent,
+        ResizeEvent,
+        TypedEvent,
+        WorkingThread,
+    )
+    from .object import CharmyObject
+    from .pos import Pos
+    from .rect import Rect, RectArray
+    from .size import Size
+    from .frameworks import Frameworks
+    from .styles import *
+    from .var import BooleanVar, FloatVar, IntVar, StringVar, Var
+    from .widgets import *
+
+
+def __getattr__(name: str):
+    # The manager is created on first use, see `get_manager()`
+    if name == "manager":
+        return get_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,70 @@
+import argparse
+
 import charmy as cm
 
-if __name__ == "__main__":
+
+def demo() -> None:
+    """Open the demo window."""
     window = cm.Window(size=(300, 160), title="Charmy GUI")
 
     button = cm.Button()
 
     cm.mainloop()
+
+
+def importtime(args: argparse.Namespace) -> None:
+    """Print how long the startup phases of charmy took."""
+    if args.frameworks or args.manager:
+        frameworks = cm.CharmyObject.attributes["frameworks"]
+        frameworks.drawing, frameworks.ui, frameworks.backend  # NOQA
+    if args.manager:
+        cm.get_manager()
+    print(cm.startup_timings.report())
+
+
+def diag(args: argparse.Namespace) -> None:
+    """Print the living registered objects of each class."""
+    if args.demo:
+        window = cm.Window(size=(300, 160), title="Charmy GUI")
+        cm.Button()
+        cm.get_manager().update()
+    elif args.manager:
+        cm.get_manager()
+    print(cm.CharmyObject.diagnostics_report(oldest=args.oldest))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m charmy", description="Charmy GUI")
+    subparsers = parser.add_subparsers(dest="command")
+
+    importtime_parser = subparsers.add_parser(
+        "importtime", help="print how long the startup phases of charmy took"
+    )
+    importtime_parser.add_argument(
+        "--frameworks", action="store_true", help="also load the drawing, UI and backend frameworks"
+    )
+    importtime_parser.add_argument(
+        "--manager", action="store_true", help="also create the manager, loading the frameworks"
+    )
+
+    diag_parser = subparsers.add_parser(
+        "diag", help="print the living objects of each class and the memory they use"
+    )
+    diag_parser.add_argument(
+        "--manager", action="store_true", help="create the manager first, loading the frameworks"
+    )
+    diag_parser.add_argument(
+        "--demo", action="store_true", help="create the demo window first and draw it once"
+    )
+    diag_parser.add_argument(
+        "--oldest", type=int, default=3, help="how many of the oldest instances to name"
+    )
+
+    args = parser.parse_args()
+    match args.command:
+        case "importtime":
+            importtime(args)
+        case "diag":
+            diag(args)
+        case _:
+            demo()
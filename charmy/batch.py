@@ -0,0 +1,198 @@
+"""
+Batched drawing data backed by NumPy arrays.
+"""
+
+import importlib
+import typing
+
+from .event import Event, EventHandling
+from .rect import Rect
+
+RECT_BATCH_DTYPE = [
+    ("x", "f4"),
+    ("y", "f4"),
+    ("w", "f4"),
+    ("h", "f4"),
+    ("radius", "f4"),
+    ("color", "u4"),  # Packed ARGB, the same layout as skia.Color
+]
+
+
+class RectBatch(EventHandling):
+    """RectBatch stores many rectangles in one structured NumPy array.
+
+    Each row holds ``x``, ``y``, ``w``, ``h``, ``radius`` and a packed ARGB ``color``. Drawing
+    frameworks draw a batch in bulk, one call per color group instead of one per rectangle, and
+    only rebuild the groups whose rows changed since the last draw.
+
+    Add it to a widget with ``widget.add_element("rects", rect=batch.bounds(), batch=batch)``.
+    The widget does not need to be placed over the batch: the element follows the bounds of the
+    batch, and the old and new areas are redrawn on every change. Changes must go through
+    `update()` or item assignment, which trigger a ``change`` event; reading with ``batch[...]``
+    gives read-only views.
+
+    By default, rows are drawn grouped by color, so rectangles of different colors overlapping
+    each other are not painted in row order: the order between colors is unspecified. Pass
+    ``ordered=True`` to paint in row order, one draw call per run of consecutive rows sharing a
+    color, rebuilt entirely on any change. Sorting the rows by color keeps the runs few.
+
+    Example
+    -------
+    .. code-block:: python
+
+        batch = RectBatch(10000)
+        batch.update(slice(0, 100), x=xs, y=ys, w=8, h=8, color=RectBatch.pack_color(255, 0, 0))
+        batch[5] = (0, 0, 10, 10, 2, RectBatch.pack_color(0, 0, 255))
+
+    Args:
+        size: Number of rectangles, all zeroed.
+        data: A structured array of `RECT_BATCH_DTYPE` to use instead, without copying.
+        ordered: Whether overlapping rectangles are painted in row order.
+    """
+
+    def __init__(self, size: int = 0, data: typing.Any = None, ordered: bool = False):
+        super().__init__()
+        try:
+            self.numpy = importlib.import_module("numpy")
+        except ImportError as e:
+            raise ImportError("RectBatch requires numpy, please install it first.") from e
+
+        if data is None:
+            data = self.numpy.zeros(size, dtype=RECT_BATCH_DTYPE)
+        elif data.dtype != self.numpy.dtype(RECT_BATCH_DTYPE):
+            raise TypeError(f"RectBatch data must be of dtype {RECT_BATCH_DTYPE}")
+        self.data = data
+        self.ordered: bool = ordered
+
+        self.dirty_colors: set[int] | None = None  # Changed color groups, None for all
+        # Drawing framework data per color group, or per run of rows when `ordered`
+        self.draw_cache: dict[int, typing.Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index):
+        # Writing to the result would skip the change tracking of `__setitem__()`
+        view = self.data.view()
+        view.flags.writeable = False
+        return view[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, str):  # A whole field, e.g. batch["x"] = xs
+            self.update(slice(None), **{index: value})
+            return
+        self._mark_colors(index)
+        self.data[index] = value
+        self._mark_colors(index)
+        self.trigger(Event(self, "change", index=index))
+
+    @staticmethod
+    def pack_color(r, g, b, a=255):
+        """Pack color components (0-255) into ARGB, also works on arrays.
+
+        Args:
+            r: The red component of the color.
+            g: The green component of the color.
+            b: The blue component of the color.
+            a: The alpha component of the color.
+        """
+        # Arrays of small integer types would overflow when shifted
+        r, g, b, a = (
+            component.astype("u4") if hasattr(component, "astype") else component
+            for component in (r, g, b, a)
+        )
+        return (a << 24) | (r << 16) | (g << 8) | b
+
+    def update(self, index, **fields) -> typing.Self:
+        """Set fields of some rows in place.
+
+        Example
+        -------
+        .. code-block:: python
+
+            batch.update(slice(100, 200), y=new_ys, color=colors)
+
+        Args:
+            index: Row index, slice, integer array or boolean mask.
+            **fields: Field name (``x``, ``y``, ``w``, ``h``, ``radius``, ``color``) to a scalar
+                or to an array matching the rows.
+        """
+        if "color" in fields:
+            self._mark_colors(index)
+        for name, value in fields.items():
+            self.data[name][index] = value
+        self._mark_colors(index)
+        self.trigger(Event(self, "change", index=index))
+        return self
+
+    def set_data(self, data) -> typing.Self:
+        """Replace all rows with another structured array.
+
+        Args:
+            data: A structured array of `RECT_BATCH_DTYPE`.
+        """
+        if data.dtype != self.numpy.dtype(RECT_BATCH_DTYPE):
+            raise TypeError(f"RectBatch data must be of dtype {RECT_BATCH_DTYPE}")
+        self.data = data
+        self.dirty_colors = None
+        self.trigger(Event(self, "change", index=None))
+        return self
+
+    def _mark_colors(self, index) -> None:
+        """Mark the color groups of some rows as changed."""
+        if self.dirty_colors is not None:
+            self.dirty_colors.update(self.numpy.unique(self.data["color"][index]).tolist())
+
+    def take_dirty_colors(self) -> set[int] | None:
+        """Return the color groups changed since the last call, None meaning all of them."""
+        dirty_colors, self.dirty_colors = self.dirty_colors, set()
+        return dirty_colors
+
+    def groups(
+        self, colors: typing.Iterable[int] | None = None
+    ) -> typing.Iterator[tuple[int, typing.Any]]:
+        """Iterate over the rows grouped by color.
+
+        Args:
+            colors: Only yield these color groups, an empty array for colors without rows.
+                Defaults to None, all groups.
+
+        Yields:
+            tuple[int, numpy.ndarray]: The color and its rows.
+        """
+        color_column = self.data["color"]
+        if colors is None:
+            order = self.numpy.argsort(color_column, kind="stable")
+            sorted_colors = color_column[order]
+            unique_colors, starts = self.numpy.unique(sorted_colors, return_index=True)
+            for color, rows in zip(
+                unique_colors.tolist(), self.numpy.split(self.data[order], starts[1:])
+            ):
+                yield color, rows
+        else:
+            for color in colors:
+                yield color, self.data[color_column == color]
+
+    def runs(self) -> typing.Iterator[tuple[int, typing.Any]]:
+        """Iterate over the runs of consecutive rows sharing a color, in row order.
+
+        Yields:
+            tuple[int, numpy.ndarray]: The color and the rows of the run.
+        """
+        color_column = self.data["color"]
+        if not len(color_column):
+            return
+        starts = self.numpy.flatnonzero(color_column[1:] != color_column[:-1]) + 1
+        for rows in self.numpy.split(self.data, starts):
+            yield int(rows["color"][0]), rows
+
+    def bounds(self) -> Rect:
+        """Return the area covered by all rectangles."""
+        if not len(self.data):
+            return Rect()
+        return Rect.make_LTRB(
+            float(self.data["x"].min()),
+            float(self.data["y"].min()),
+            float((self.data["x"] + self.data["w"]).max()),
+            float((self.data["y"] + self.data["h"]).max()),
+        )
@@ -1,10 +1,16 @@
+import asyncio
+import collections
+import threading
+import time
 import typing
 import warnings
 
-from .const import MANAGER_ID
-from .event import WorkingThread
+from .const import MANAGER_ID, FrameMode
+from .event import EventHandling, WorkingThread
 from .frameworks import Frameworks
 from .object import CharmyObject
+from .profiling import export_chrome_trace, startup_timings
+from .scheduler import FrameScheduler
 
 
 class GLFWError(Exception):
@@ -19,12 +25,16 @@ class CharmyManager(CharmyObject):
     Args:
         is_vsync: Is vsync enabled.
         samples: UI Samples.
+        frame_mode: How to pace frames, see `FrameScheduler`.
+        fps: Target frame rate of `FrameMode.FIXED_FPS`.
     """
 
     def __init__(
         self,
         vsync: bool = True,
         samples: int = 4,
+        frame_mode: FrameMode = FrameMode.ON_DEMAND,
+        fps: int | float = 60,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -35,8 +45,10 @@ class CharmyManager(CharmyObject):
         #    warnings.warn("There should be only one instance of CApp.")
 
         self.event_thread = WorkingThread()
+        self.timers = EventHandling.timer_queue()  # Runs delay and repeat tasks
 
-        self.cset("frameworks", Frameworks())
+        if self.cget("frameworks") is None:
+            self.cset("frameworks", Frameworks())
         self.cset("ui.framework", self.cget("frameworks").ui)
         self.cset("ui.framework.name", self.cget("frameworks").ui_name)
         self.cset("ui.is_vsync", vsync)
@@ -48,44 +60,174 @@ class CharmyManager(CharmyObject):
         self.cset("backend.framework.name", self.cget("frameworks").backend_name)
 
         self.is_alive: bool = False  # Is the manager running
+        self.scheduler = FrameScheduler(frame_mode, fps)
+        self.thread_id: int = threading.get_ident()  # The thread running the loop
+        self.async_loop: asyncio.AbstractEventLoop | None = None  # Set by `async_mainloop()`
+        self._async_wake: asyncio.Event | None = None
+        # Calls posted by other threads: (key, [(function, args), ...]), one entry per
+        # `call_soon_threadsafe*()`. `deque.append()` and `popleft()` are atomic, so posting
+        # takes no lock
+        self.calls: collections.deque[
+            tuple[typing.Hashable, typing.Sequence[tuple[typing.Callable, tuple]]]
+        ] = collections.deque()
+        self._is_calls_woken: bool = False  # A wake-up is posted for the queued calls
+        self.timers.wake = self.wake  # A new earliest timer shortens the current wait
 
         self._init_ui_framework()
 
     def _init_ui_framework(self):
         """According to attribute `ui.framework` to init ui framework"""
-        self.cget("ui.framework").init(error_callback=self.error, samples=self.cget("ui.samples"))
+        with startup_timings.phase("ui.init"):
+            self.cget("ui.framework").init(
+                error_callback=self.error, samples=self.cget("ui.samples")
+            )
+
+    def update(self, wait: bool = True):
+        """Update the Windows' UI and events
+
+        Waits for events as long as the frame scheduler and the next timer allow, runs the
+        timers due, then draws the windows if a frame is due.
+
+        Args:
+            wait: Whether to wait for events, False to only process the pending ones.
+        """
+        ui_framework = self.attributes.ui_framework
+        windows = [w for w in self.attributes.ui_windows if w.is_visible and w.is_alive]
+
+        start = time.perf_counter()
+        for window in windows:
+            window.frame_timings.begin_frame(start)  # Goes on if the last round drew nothing
+        dispatch_before = sum(window.frame_timings.current("dispatch") for window in windows)
+        ui_framework.wait_events(self.next_timeout() if wait else 0)
+        for window in windows:
+            window.flush_events()  # Events held back by `coalesce_events`
+        # Handlers ran inside `wait_events()`, their time is recorded by each window
+        dispatch = (
+            sum(window.frame_timings.current("dispatch") for window in windows) - dispatch_before
+        )
+        poll = time.perf_counter() - start - dispatch
+        self.timers.run_due()
+        self.run_calls()
+
+        is_frame_due = self.scheduler.is_frame_due()
+        for window in windows:
+            window.frame_timings.add("poll", poll)
+            # Rounds drawing nothing, e.g. woken up by a timer, are no frames
+            if is_frame_due and window.update():
+                window.frame_timings.end_frame()
+        if is_frame_due:
+            self.scheduler.frame_done()
+
+    def next_timeout(self) -> float | None:
+        """Return how long the loop may sleep: until the next frame or the next timer.
+
+        Returns:
+            float | None: Seconds, or None to sleep until an event comes.
+        """
+        timeout = self.scheduler.timeout(self.has_pending_work())
+        timer_timeout = self.timers.timeout()
+        if timer_timeout is not None and (timeout is None or timer_timeout < timeout):
+            timeout = timer_timeout
+        return timeout
+
+    def export_frame_trace(self, file) -> None:
+        """Write the frame timings of all windows as Chrome trace-event JSON.
+
+        Args:
+            file: A path, or a text file.
+        """
+        export_chrome_trace(
+            {window.id: window.frame_timings for window in self.attributes.ui_windows}, file
+        )
+
+    def call_soon_threadsafe(
+        self, function: typing.Callable, *args, key: typing.Hashable = None
+    ) -> None:
+        """Run a function in the loop thread, before the next frame is drawn.
+
+        It can be called from any thread, and wakes the loop up. Calls run in the order they
+        were posted. Calls posted with the same ``key`` before the loop gets to them are
+        coalesced: only the latest one runs. Exceptions raised by the calls propagate out of
+        the main loop, like those of event handlers.
 
-    def update(self):
-        """Update the Windows' UI and events"""
+        Example
+        -------
+        .. code-block:: python
 
-        self.glfw = self.cget("ui.framework").glfw
-        self.glfw.wait_events()
+            def on_quote(symbol, price):  # Called by a data-feed thread
+                manager.call_soon_threadsafe(labels[symbol].set_text, price, key=symbol)
 
-        for window in self.cget("ui.windows"):
-            if window.is_visible and window.is_alive:
-                window.update()
+        Args:
+            function: The function to call.
+            *args: The arguments to call it with.
+            key: Calls with the same key replace the pending ones, None to never coalesce.
+        """
+        self.calls.append((key, ((function, args),)))
+        self._wake_for_calls()
 
-        # TODO: 能不能换个地方？比如说framework.py?
-        # TODO: CharmyManager过度耦合glfw, 没有考虑其他框架
+    def call_soon_threadsafe_batch(
+        self, calls: typing.Iterable[tuple[typing.Callable, tuple]], key: typing.Hashable = None
+    ) -> None:
+        """Post many calls with `call_soon_threadsafe()` at once, waking the loop up only once.
 
-        windows = self.cget("ui.windows")
-        if windows:
-            first_alive_window = next((w for w in windows if w.is_visible and w.is_alive), None)
-            if first_alive_window:
-                self.glfw.make_context_current(first_alive_window.the_window)
+        The batch is coalesced as a whole: a batch or call posted later with the same ``key``
+        replaces all of its calls.
 
-            self.glfw.swap_interval(1 if self.cget("ui.is_vsync") else 0)  # 是否启用垂直同步
+        Args:
+            calls: Pairs of a function and its arguments, run in order.
+            key: Coalescing key of the batch, see `call_soon_threadsafe()`.
+        """
+        self.calls.append((key, list(calls)))
+        self._wake_for_calls()
 
-        # not implemented yet
-        # input_mode: bool = True
+    def _wake_for_calls(self) -> None:
+        # Only the first call since the last drain posts a wake-up, as `run_calls()` clears the
+        # flag before popping, no call is left waiting without one
+        if not self._is_calls_woken:
+            self._is_calls_woken = True
+            self.wake()
 
-        # if input_mode:
-        #    self.glfw.poll_events()
-        # else:
-        #    # if self._check_delay_events()
-        #    self.glfw.wait_events()
+    def run_calls(self) -> None:
+        """Run the calls posted with `call_soon_threadsafe()`.
 
-        self.glfw.wait_events()
+        Only the calls already queued run, those posted meanwhile wait for the next round.
+        """
+        self._is_calls_woken = False
+        calls = self.calls
+        count = len(calls)
+        if not count:
+            return
+        batch = [calls.popleft() for _ in range(count)]
+        # The latest entry of each key wins
+        latest = {key: index for index, (key, _) in enumerate(batch) if key is not None}
+        for index, (key, entry_calls) in enumerate(batch):
+            if key is None or latest[key] == index:
+                for function, args in entry_calls:
+                    function(*args)
+
+    def has_pending_work(self) -> bool:
+        """Return whether something waits for the next frame, so the loop must not block."""
+        if self.calls:
+            return True
+        for window in self.attributes.ui_windows:
+            if window.is_dirty and window.is_visible and window.is_alive:
+                return True
+        return False
+
+    def wake(self) -> None:
+        """Wake the loop up if it is waiting for events.
+
+        Call it after changing UI state from another thread. Calls from the loop thread itself
+        need no wake-up, as the loop checks for pending work before waiting, except under
+        `async_mainloop()`, where coroutines run while the loop waits.
+        """
+        if self.async_loop is not None:
+            try:
+                self.async_loop.call_soon_threadsafe(self._async_wake.set)
+            except RuntimeError:  # The asyncio loop is closed
+                pass
+        elif threading.get_ident() != self.thread_id:
+            self.attributes.ui_framework.post_empty_event()
 
     def mainloop(self):
         """Start mainloop.
@@ -95,27 +237,19 @@ class CharmyManager(CharmyObject):
 
         If no windows are added to the manager, a warning will be issued.
         """
-        if not self.cget("ui.windows"):
+        if not self.attributes.ui_windows:
             warnings.warn(
                 "At least one window is required to run manager!",
             )
 
         self.is_alive: bool = True
-        self.event_thread.start()
+        self.thread_id = threading.get_ident()
 
         # Main loop
         while self.is_alive:
             try:
-                # quit when no window in list now
-                if not self.cget("ui.windows"):
-                    self.quit()
+                if not self._close_windows():
                     break
-
-                for window in self.cget("ui.windows"):
-                    if window.can_be_close():
-                        self.destroy_window(window)  # remove window if closed
-                        window.destroy()
-
                 self.update()
             except Exception as e:
                 self.is_alive = False
@@ -123,13 +257,90 @@ class CharmyManager(CharmyObject):
 
         self.cleanup()
 
+    async def async_mainloop(self, poll_interval: float = 1 / 120):
+        """Run the main loop as a coroutine, sharing its thread with the running asyncio loop.
+
+        Instead of blocking in the UI framework, the loop processes the pending events, then
+        awaits until the next frame or timer is due, so other coroutines and their network I/O
+        run in between. The UI framework cannot wake asyncio up, so while waiting, input is
+        checked every ``poll_interval`` seconds. `wake()` and marking a window dirty end the
+        wait at once, from coroutines and other threads alike.
+
+        Handlers bound as ``async def`` run as tasks of this asyncio loop.
+
+        Example
+        -------
+        .. code-block:: python
+
+            async def main():
+                window = cm.Window()
+                server = await asyncio.start_server(handle_client, port=8000)
+                await cm.async_mainloop()
+
+            asyncio.run(main())
+
+        Args:
+            poll_interval: Longest time in seconds between two checks for input.
+        """
+        if not self.attributes.ui_windows:
+            warnings.warn(
+                "At least one window is required to run manager!",
+            )
+
+        self.is_alive: bool = True
+        self.thread_id = threading.get_ident()
+        self._async_wake = asyncio.Event()
+        self.async_loop = asyncio.get_running_loop()
+
+        try:
+            while self.is_alive:
+                # Cleared before polling, so a wake-up during the update is not lost
+                self._async_wake.clear()
+                if not self._close_windows():
+                    break
+                self.update(wait=False)
+
+                timeout = self.next_timeout()
+                if timeout is None or timeout > poll_interval:
+                    timeout = poll_interval
+                try:
+                    await asyncio.wait_for(self._async_wake.wait(), timeout)
+                except TimeoutError:
+                    pass
+        except Exception:
+            self.is_alive = False
+            raise
+        finally:
+            self.async_loop = None
+            self._async_wake = None
+
+        self.cleanup()
+
+    def _close_windows(self) -> bool:
+        """Destroy the closed windows, quitting when none is left.
+
+        Returns:
+            bool: Whether the loop should go on.
+        """
+        # quit when no window in list now
+        windows = self.attributes.ui_windows
+        if not windows:
+            self.quit()
+            return False
+
+        for window in list(windows):
+            if window.can_be_close():
+                self.destroy_window(window)  # remove window if closed
+                window.destroy()
+        return True
+
     def add_window(self, window):
         """Add a window to the manager.
 
         Args:
             window (charmy.widgets.WindowBase): The window to be added.
         """
-        self.cget("ui.windows").append(window)
+        self.attributes.ui_windows.append(window)
 
     def destroy_window(self, window):
         """Destroy a window from the manager.
@@ -137,23 +348,28 @@ class CharmyManager(CharmyObject):
         Args:
             window (charmy.widgets.WindowBase): The window to be destroyed.
         """
-        if window in self.cget("ui.windows"):
-            self.cget("ui.windows").remove(window)
+        windows = self.attributes.ui_windows
+        if window in windows:
+            windows.remove(window)
 
     def cleanup(self) -> None:
         """Clean up resources."""
         match self.cget("ui.framework.name"):
             case "GLFW":
-                for window in self.cget("ui.windows"):
-                    self.glfw.destroy_window(window.the_window)
-                self.glfw.terminate()
+                glfw = self.cget("ui.framework").glfw
+                for window in self.attributes.ui_windows:
+                    glfw.destroy_window(window.the_window)
+                glfw.terminate()
+            case "HEADLESS":
+                for window in self.attributes.ui_windows:
+                    self.cget("ui.framework").destroy(window.the_window)
 
         self.quit()
 
     def quit(self) -> None:
         """Quit the mainloop."""
         self.is_alive = False
-        self.event_thread.is_alive = False
+        self.event_thread.shutdown(wait=False)
 
     @staticmethod
     def error(error_code: typing.Any, description: bytes):
@@ -167,19 +383,54 @@ class CharmyManager(CharmyObject):
         raise GLFWError(f"GLFW Error {error_code}: {description.decode()}")
 
 
-# Auto create Manager Object
+# Frameworks are loaded on first use, so sharing them costs nothing until then. Colors and
+# canvases find them here even before the manager exists.
+CharmyObject.attributes.setdefault("frameworks", Frameworks())
+
 
-manager: CharmyManager = CharmyManager(id_=MANAGER_ID)
+_default_manager: CharmyManager | None = None  # `CharmyObject.objects` only holds weak references
+
+
+def get_manager() -> CharmyManager:
+    """Return the default manager, creating it on first use.
+
+    It is created by the first window, so importing charmy neither loads the UI framework nor
+    opens a connection to the display.
+
+    Returns:
+        CharmyManager: The manager registered as `MANAGER_ID`.
+    """
+    global _default_manager
+    manager = CharmyObject.objects.get(MANAGER_ID)
+    if manager is None:
+        with startup_timings.phase("manager"):
+            manager = CharmyManager(id_=MANAGER_ID)
+    _default_manager = manager
+    return manager
+
+
+def __getattr__(name: str):
+    # `manager` used to be created at import, keep it available as a module attribute
+    if name == "manager":
+        return get_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def mainloop() -> None:
     """Start main loop."""
     try:
-        manager.mainloop()
+        get_manager().mainloop()
     except Exception as e:
         raise e
 
 
+async def async_mainloop(poll_interval: float = 1 / 120) -> None:
+    """Run the main loop as a coroutine, see `CharmyManager.async_mainloop()`."""
+    await get_manager().async_mainloop(poll_interval)
+
+
 def cquit():  # NOQA
     """Quit the main loop"""
-    manager.quit()
+    manager = CharmyObject.objects.get(MANAGER_ID)
+    if manager is not None:
+        manager.quit()
@@ -18,12 +18,14 @@ class ID(Enum):
 @dataclasses.dataclass
 class Backends:
     OPENGL = opengl = "OPENGL"
+    RASTER = raster = "RASTER"
 
 
 @dataclasses.dataclass
 class UI:
     GLFW = glfw = "GLFW"
     SDL = sdl = "SDL"
+    HEADLESS = headless = "HEADLESS"
 
 
 @dataclasses.dataclass
@@ -41,6 +43,18 @@ class DrawingMode(Enum):
     RETAINED = retained = "READIED"
 
 
+class FrameMode(Enum):
+    """FrameMode is an enum to store how the manager paces frames.
+    ON_DEMAND(on_demand): Sleep until an input event or an invalidation arrives.
+    FIXED_FPS(fixed_fps): Draw at a steady rate, sleeping until the next frame deadline.
+    CONTINUOUS(continuous): Draw frames back to back.
+    """
+
+    ON_DEMAND = on_demand = "ON_DEMAND"
+    FIXED_FPS = fixed_fps = "FIXED_FPS"
+    CONTINUOUS = continuous = "CONTINUOUS"
+
+
 MANAGER_ID = "manager"
 
 
@@ -53,3 +67,5 @@ if sys.platform.startswith("darwin"):
     PLATFORM = "macos"
 elif sys.platform == "win32":
     PLATFORM = "windows"
+else:
+    PLATFORM = "linux"
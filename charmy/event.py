@@ -1,14 +1,115 @@
 from __future__ import annotations as _
 
+import asyncio
 import collections.abc
+import concurrent.futures
+import functools
+import itertools
 import re
 import threading
-import time
 import typing
 import warnings
 
 from .const import ID
 from .object import CharmyObject
+from .scheduler import Timer, TimerQueue
+
+
+# region Event type codes
+
+_event_codes: dict[str, int] = {}  # {event type string: code}
+_event_codes_lock = threading.Lock()
+
+
+def event_code(event_type: str) -> int:
+    """Return the integer code of an event type string, interning it on first use.
+
+    Args:
+        event_type: e.g. ``"mouse_move"``, ``"key_press[ctrl+s]"`` or ``"key_press[*]"``.
+    """
+    code = _event_codes.get(event_type)
+    if code is None:
+        with _event_codes_lock:
+            code = _event_codes.setdefault(event_type, len(_event_codes))
+    return code
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_event_type(event_type_str: str) -> tuple[str, tuple[str, ...]]:
+    """Parse an event type string into its type and parameters, caching the result.
+
+    Args:
+        event_type_str: e.g. ``"key_press[ctrl+s]"``.
+
+    Returns:
+        tuple[str, tuple[str, ...]]: e.g. ``("key_press", ("ctrl+s",))``.
+    """
+    if not re.match(".*\\[.*\\]", event_type_str):  # NOQA
+        return event_type_str, ()
+    event_type = re.findall("^(.*?)\\[", event_type_str)[0]
+    params_raw = re.findall("\\[(.*?)\\]$", event_type_str)[0]  # NOQA
+    params = params_raw.split(",")
+    if len(params) == 1:
+        if params[0].strip() == "":
+            params = []
+    return event_type, tuple(params)
+
+
+@functools.lru_cache(maxsize=4096)
+def dispatch_codes(event_type_str: str) -> tuple[int, int]:
+    """Return the codes of the bindings an event triggers, computed once per type string.
+
+    An event ``key_press`` triggers the tasks bound to ``key_press`` and ``key_press[*]``, an
+    event ``key_press[ctrl+s]`` those bound to ``key_press`` and ``key_press[ctrl+s]``.
+
+    Args:
+        event_type_str: The type of the triggered event.
+    """
+    event_type, params = parse_event_type(event_type_str)
+    if params:
+        return event_code(event_type), event_code(event_type_str)
+    return event_code(event_type), event_code(event_type + "[*]")
+
+
+@functools.lru_cache(maxsize=4096)
+def event_bit(event_type_str: str) -> int:
+    """Return the bit of an event type in listener masks.
+
+    Parameterized types share the bit of their type, e.g. ``key_press[ctrl+s]`` has the bit of
+    ``key_press``, so a mask tells whether any ``key_press`` event can reach a handler.
+
+    Args:
+        event_type_str: e.g. ``"mouse_move"``.
+    """
+    return 1 << event_code(parse_event_type(event_type_str)[0])
+
+
+# Events a UI framework event leads to once routed through the widget tree, see `WindowBase`
+_ROUTED_EVENTS: dict[str, tuple[str, ...]] = {
+    "mouse_move": ("mouse_move", "mouse_enter", "mouse_leave"),
+    "mouse_press": ("mouse_press", "click"),
+    "mouse_release": ("mouse_release", "click"),
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def trigger_mask(event_type_str: str) -> int:
+    """Return the bits of the event types an event coming from a UI framework can trigger.
+
+    A ``mouse_move`` also updates the widgets under the mouse, which then receive
+    ``mouse_enter`` and ``mouse_leave``, and a ``mouse_release`` following a ``mouse_press``
+    makes a ``click``. Event sources compare this mask with `subtree_listener_mask`.
+
+    Args:
+        event_type_str: e.g. ``"mouse_move"``.
+    """
+    mask = 0
+    for event_type in _ROUTED_EVENTS.get(event_type_str, (event_type_str,)):
+        mask |= event_bit(event_type)
+    return mask
+
+
+# endregion
 
 
 class EventHandling(CharmyObject):
@@ -27,27 +128,90 @@ class EventHandling(CharmyObject):
         # Key events
         "key_press", "key_release", "key_repeat", "char", 
         # Special events
-        "delay", "repeat", 
+        "delay", "repeat", "error",
     ]
     # fmt: on
-    multithread_tasks: list[tuple[EventTask, Event]] = []
-    WORKING_THREAD: threading.Thread
+    WORKING_THREAD: WorkingThread | None = None  # Runs multithread tasks, see `working_thread()`
+    TIMERS: TimerQueue | None = None  # Runs delay and repeat tasks, see `timer_queue()`
+    ASYNC_TASKS: set[asyncio.Task] = set()  # Running ``async def`` handlers, kept referenced
 
     @staticmethod
-    def _execute_task(task: EventTask | DelayTask, event_obj: Event) -> None:
-        """To execute the bound task directly, regardless its props, mainly for internal use."""
-        match task.target:
-            case _ if callable(task.target):
-                task.target(event_obj)
-            case _ if isinstance(task.target, collections.abc.Iterable):
-                for task_step in task.target:
-                    task_step(event_obj)
+    def _execute_task(
+        task: EventTask | DelayTask, event_obj: Event, target: typing.Any = None
+    ) -> None:
+        """To execute the bound task directly, regardless its props, mainly for internal use.
+
+        ``target`` replaces the target of the task when given.
+        """
+        if target is None:
+            target = task.target
+        match target:
+            case _ if callable(target):
+                EventHandling._run_target(target, task, event_obj)
+            case _ if isinstance(target, collections.abc.Iterable):
+                for task_step in target:
+                    EventHandling._run_target(task_step, task, event_obj)
             case _:
                 raise ValueError(
                     "Error type for suzaku Task target! Excepted callable or "
-                    f"iterable but received {type(task.target)}"
+                    f"iterable but received {type(target)}"
                 )
 
+    @staticmethod
+    def _run_target(target: typing.Callable, task: EventTask, event_obj: Event) -> None:
+        """Call a task target, scheduling the coroutine of an ``async def`` target.
+
+        With an asyncio loop running in this thread (see `charmy.async_mainloop()`), the
+        coroutine becomes a task of it. Otherwise, as in a worker thread or under
+        `charmy.mainloop()`, it is run to the end right away, like a plain function.
+        """
+        result = target(event_obj)
+        if not asyncio.iscoroutine(result):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(result)
+            return
+        async_task = loop.create_task(result)
+        EventHandling.ASYNC_TASKS.add(async_task)
+        async_task.add_done_callback(
+            functools.partial(EventHandling._async_task_done, task, event_obj)
+        )
+
+    @staticmethod
+    def _async_task_done(task: EventTask, event_obj: Event, async_task: asyncio.Task) -> None:
+        """Report the exception of an ``async def`` handler once it is done."""
+        EventHandling.ASYNC_TASKS.discard(async_task)
+        if not async_task.cancelled() and async_task.exception() is not None:
+            EventHandling.report_task_error(
+                event_obj.widget, async_task.exception(), task, event_obj, "Async task"
+            )
+
+    @staticmethod
+    def report_task_error(
+        owner: EventHandling | None,
+        exception: Exception,
+        task: EventTask,
+        event_obj: Event | TypedEvent,
+        kind: str = "Task",
+    ) -> None:
+        """Trigger an ``error`` event for a task that raised outside of `trigger()`.
+
+        Without ``error`` handlers on the owner, a warning is issued instead.
+
+        Args:
+            owner: The object the task is bound to.
+            exception: The exception raised.
+            task: The task that raised it.
+            event_obj: The event passed to the task.
+            kind: What kind of task it is, for the warning.
+        """
+        if owner is not None and owner.has_listeners("error", subtree=False):
+            owner.trigger(Event(owner, "error", exception=exception, task=task, event=event_obj))
+        else:
+            warnings.warn(f"{kind} {task.id} raised {exception!r}", RuntimeWarning)
+
     def __init__(self):
         """A class containing event handling abilities.
 
@@ -66,10 +230,17 @@ class EventHandling(CharmyObject):
         """
         super().__init__()
         self.latest_event: Event = Event(widget=None, event_type="NO_EVENT")
-        self.tasks: dict[str, list[EventTask]] = {}
-        ## Initialize tasks list
-        for event_type in self.__class__.EVENT_TYPES:
-            self.tasks[event_type] = []
+        # Bound tasks of each event type by ID, in binding order. Dicts remove a task in O(1)
+        self.tasks: dict[str, dict[str, EventTask]] = {}
+        # Bits (see `event_bit()`) of the event types with tasks bound to this object, and to
+        # this object or any of its descendants. Event sources check them before building events
+        self.listener_mask: int = 0
+        self.subtree_listener_mask: int = 0
+        # The same task dicts keyed by event code, which is what triggering looks up, and the
+        # tuples of their tasks, built on the first trigger after a change
+        self.dispatch_table: dict[int, dict[str, EventTask]] = {}
+        self._dispatch_cache: dict[int, tuple[EventTask, ...]] = {}
+        self._task_ids = itertools.count()  # Task IDs are never reused, even after unbinding
 
     def parse_event_type_str(self, event_type_str: str) -> dict:  # NOQA
         """This function parses event type string.
@@ -77,17 +248,87 @@ class EventHandling(CharmyObject):
         :param event_type_str: The event type string to be parsed
         :returns: JSON, parsed event type
         """
-        if not re.match(".*\\[.*\\]", event_type_str):  # NOQA
-            return {"type": event_type_str, "params": []}
-        event_type = re.findall("^(.*?)\\[", event_type_str)[0]
-        params_raw = re.findall("\\[(.*?)\\]$", event_type_str)[0]  # NOQA
-        params = params_raw.split(",")
-        if len(params) == 1:
-            if params[0].strip() == "":
-                params = []
-        return {"type": event_type, "params": params}
-
-    def execute_task(self, task: EventTask, event_obj: Event | None = None):
+        event_type, params = parse_event_type(event_type_str)
+        return {"type": event_type, "params": list(params)}
+
+    # region Listener masks
+
+    def has_listeners(self, event_type: str, subtree: bool = True) -> bool:
+        """Return whether an event of this type would run any task.
+
+        Example
+        -------
+        .. code-block:: python
+
+            if window.has_listeners("mouse_move"):
+                window.trigger(Event(window, "mouse_move", x=x, y=y))
+
+        Args:
+            event_type: The type of the event.
+            subtree: Whether to count tasks bound to descendants, which routed events reach.
+        """
+        mask = self.subtree_listener_mask if subtree else self.listener_mask
+        return bool(mask & event_bit(event_type))
+
+    def update_listener_mask(self) -> None:
+        """Recompute `listener_mask` from the bound tasks, e.g. after unbinding."""
+        mask = 0
+        for event_type, tasks in self.tasks.items():
+            if tasks:
+                mask |= event_bit(event_type)
+        self.listener_mask = mask
+        self.update_subtree_listener_mask()
+
+    def update_subtree_listener_mask(self) -> None:
+        """Recompute `subtree_listener_mask` here and in the ancestors whose mask changes."""
+        mask = self.listener_mask
+        for child in getattr(self, "children", ()):
+            mask |= getattr(child, "subtree_listener_mask", 0)
+        node = self
+        while mask != node.subtree_listener_mask:
+            is_reduced = bool(node.subtree_listener_mask & ~mask)
+            node.subtree_listener_mask = mask
+            node = getattr(node, "parent", None)
+            if not isinstance(node, EventHandling):
+                break
+            if is_reduced:
+                # A bit may be gone from the whole subtree, only the siblings can tell
+                mask = node.listener_mask
+                for child in getattr(node, "children", ()):
+                    mask |= getattr(child, "subtree_listener_mask", 0)
+            else:
+                mask |= node.subtree_listener_mask  # Only bits were added, no need to rescan
+
+    def add_subtree_listener_mask(self, mask: int) -> None:
+        """Add the listener bits of a new descendant to this node and its ancestors."""
+        node = self
+        while isinstance(node, EventHandling) and mask & ~node.subtree_listener_mask:
+            node.subtree_listener_mask |= mask
+            node = getattr(node, "parent", None)
+
+    # endregion
+
+    @staticmethod
+    def working_thread() -> WorkingThread:
+        """Return the working thread running the multithread tasks, creating it on first use."""
+        if EventHandling.WORKING_THREAD is None or not EventHandling.WORKING_THREAD.is_alive:
+            WorkingThread()  # Registers itself as `WORKING_THREAD`
+        return EventHandling.WORKING_THREAD
+
+    @staticmethod
+    def timer_queue() -> TimerQueue:
+        """Return the timer queue running the delay and repeat tasks, creating it on first use."""
+        if EventHandling.TIMERS is None:
+            EventHandling.TIMERS = TimerQueue()
+        return EventHandling.TIMERS
+
+    def _fire_timer_task(self, task: DelayTask | RepeatTask, event_type: str) -> None:
+        """Execute a delay or repeat task when its timer fires."""
+        self.execute_task(task, Event(self, event_type))
+
+    def execute_task(
+        self, task: EventTask, event_obj: Event | TypedEvent | None = None
+    ) -> concurrent.futures.Future | None:
         """To execute a task
 
         Example
@@ -97,6 +338,7 @@ class EventHandling(CharmyObject):
             my_task = Widget.bind("delay[5]", lambda: print("Hello Suzaku"))
             Widget.execute_task(my_task)
 
+        :return: The future of the task if it is a multithread task, otherwise None
         """
         if event_obj is None:
             event_obj = Event()
@@ -105,24 +347,30 @@ class EventHandling(CharmyObject):
             event_obj.widget = self
         if not task.multithread:
             # If not multitask, execute directly
-            EventHandling._execute_task(task, event_obj)
-            # If is a delay event, it should be removed right after execution
-            if isinstance(task, DelayTask):
-                self.unbind(task)
+            try:
+                EventHandling._execute_task(task, event_obj)
+            finally:
+                # If is a delay event, it should be removed right after execution, even if it
+                # raised
+                if isinstance(task, DelayTask) and not isinstance(task, RepeatTask):
+                    self.unbind(task)
         else:
-            # Otherwise add to multithread tasks list and let the working thread to deal with it
+            # Otherwise let the working thread deal with it
             # If is a delay task, should add some code to let it unbind itself, here is a way,
             # which is absolutely not perfect, though works, to implement this mechanism, by
             # overriding its target with a modified version
-            def self_destruct_template(task, event_obj):
-                EventHandling._execute_task(task, event_obj)
-                self.unbind(task)
-
-            if isinstance(task, DelayTask):
-                task.target = lambda event_obj: self_destruct_template(task, event_obj)
-            EventHandling.multithread_tasks.append((task, event_obj))
-
-    def trigger_event(self, event_obj: Event) -> None:
+            def self_destruct_template(task, event_obj, target):
+                try:
+                    EventHandling._execute_task(task, event_obj, target)  # The original target
+                finally:
+                    self.unbind(task)
+
+            if isinstance(task, DelayTask) and not isinstance(task, RepeatTask):
+                target = task.target
+                task.target = lambda event_obj: self_destruct_template(task, event_obj, target)
+            return EventHandling.working_thread().add_task(task, event_obj, owner=self)
+
+    def trigger_event(self, event_obj: Event | TypedEvent) -> None:
         """To trigger a type of event
 
         Args:
@@ -141,37 +389,51 @@ class EventHandling(CharmyObject):
         This shows triggering a `mouse_press` event in a `Widget`, which inherited
         `EventHandling` so has the ability to handle events.
         """
-        # Parse event type string
-        parsed_event_type = self.parse_event_type_str(event_obj.event_type)
-        # Create a default Event object if not specified
-        if event_obj is None:
-            event_obj = Event(widget=self, event_type=tuple(parsed_event_type.keys())[0])
         # Add the event to event lists (the widget itself and the global list)
         self.latest_event = event_obj
         Event.latest = event_obj
-        # Find targets
-        targets = [parsed_event_type["type"]]
-        if not parsed_event_type["params"]:
-            targets.append(parsed_event_type["type"] + "[*]")
-        else:
-            targets.append(event_obj.event_type)
-        # if parsed_event_type["params"][0] in ["", "*"]: # If match all
-        #     targets.append(parsed_event_type["type"])
-        #     targets.append(parsed_event_type["type"] + "[*]")
-        for target in targets:
-            if target in self.tasks:
-                for task in self.tasks[target]:
-                    # To execute all tasks bound under this event
+        # Find targets, the event type string is only parsed the first time it is triggered
+        for code in dispatch_codes(event_obj.event_type):
+            tasks = self._dispatch_cache.get(code)
+            if tasks is None:
+                tasks = self._dispatch_tasks(code)
+            for task in tasks:
+                # To execute all tasks bound under this event, capture ones run apart
+                if not task.capture:
                     self.execute_task(task, event_obj)
 
     trigger = trigger_event  # Alias for trigger
 
+    def trigger_capture(self, event_obj: Event | TypedEvent) -> None:
+        """Run the tasks bound with ``capture=True`` for an event routed to a descendant.
+
+        Args:
+            event_obj: The routed event.
+        """
+        for code in dispatch_codes(event_obj.event_type):
+            tasks = self._dispatch_cache.get(code)
+            if tasks is None:
+                tasks = self._dispatch_tasks(code)
+            for task in tasks:
+                if task.capture:
+                    self.execute_task(task, event_obj)
+
+    def _dispatch_tasks(self, code: int) -> tuple[EventTask, ...]:
+        """Return the tasks to run for an event code, caching them until the next change.
+
+        Triggering iterates over this tuple, so tasks may bind and unbind while it runs.
+        """
+        registry = self.dispatch_table.get(code)
+        tasks = self._dispatch_cache[code] = tuple(registry.values()) if registry else ()
+        return tasks
+
     def bind(
         self,
         event_type: str,
         target: typing.Callable | typing.Iterable,
         multithread: bool = False,
         _keep_at_clear: bool = False,
+        capture: bool = False,
     ) -> EventTask | bool:
         """To bind a task to the object when a specific type of event is triggered.
 
@@ -184,10 +446,39 @@ class EventHandling(CharmyObject):
 
         This shows binding a hello world to the button when it's press.
 
+        .. code-block:: python
+
+            my_button.bind("delay[1.5]", lambda _: print("1.5 seconds later"))
+            refresh_task = my_button.bind("repeat[0.5]", refresh)
+            my_button.unbind(refresh_task)
+
+        This shows running a task once after 1.5 seconds, and another one every 0.5 seconds
+        until it is unbound. Both are driven by the timer queue of the manager loop.
+
+        .. code-block:: python
+
+            async def upload(event):
+                async with session.post(url, data=event["value"]) as response:
+                    status_label.configure(text=response.status)
+
+            my_entry.bind("change", upload)
+
+        An ``async def`` target is scheduled as a task of the asyncio loop run by
+        `charmy.async_mainloop()`, so it can await network I/O without blocking the UI.
+
+        .. code-block:: python
+
+            dialog.bind("mouse_press", lambda event: event.stop_propagation(), capture=True)
+
+        Mouse events are routed from the window down to the widget under the mouse. Tasks
+        bound with ``capture=True`` run on the way down, before the widget's own tasks, and
+        the others on the way back up. Here the dialog keeps its children from being pressed.
+
         :param event_type: The type of event to be bound to
         :param target: A (list of) callable thing, what to do when this task is executed
         :param multithread: If this task should be executed in another thread (False by default)
         :param _keep_at_clear: If the task should be kept when cleaning the event's binding
+        :param capture: If the task should run in the capture phase of routed events
         :return: EventTask that is bound to the task if success, otherwise False
         """
         parsed_event_type = self.parse_event_type_str(event_type)
@@ -195,26 +486,38 @@ class EventHandling(CharmyObject):
             # warnings.warn(f"Event type {event_type} is not present in {self.__class__.__name__}, "
             #                "so the task cannot be bound as expected.")
             # return False
-            self.EVENT_TYPES.append(event_type)
-        if event_type not in self.tasks:
-            self.tasks[event_type] = []
-        task_id = f"{self.id}.{event_type}.{len(self.tasks[event_type])}"
+            self.EVENT_TYPES.append(parsed_event_type["type"])
+        code = event_code(event_type)
+        registry = self.tasks.get(event_type)
+        if registry is None:
+            registry = self.tasks[event_type] = self.dispatch_table[code] = {}
+        task_id = f"{self.id}.{event_type}.{next(self._task_ids)}"
         # e.g. CButton114.focus_gain.514 / CEventHandling114.focus_gain.514
         match parsed_event_type["type"]:
-            case "delay":
-                raise NotImplementedError("Delay tasks are not implemented yet!")
-                task = DelayTask(  # NOQA
-                    target,  # I will fix this type error later (ignore is ur type check is off)
-                    parsed_event_type["params"][0],
-                    multithread,
-                    _keep_at_clear,
-                    task_id,  # NOQA
+            case "delay" | "repeat":
+                if len(parsed_event_type["params"]) != 1:
+                    raise ValueError(f"Expected {event_type} to give seconds, e.g. delay[0.5]")
+                seconds = float(parsed_event_type["params"][0])
+                if parsed_event_type["type"] == "repeat" and seconds <= 0:
+                    raise ValueError(f"Expected {event_type} to repeat after more than 0 seconds")
+                if parsed_event_type["type"] == "delay":
+                    task = DelayTask(target, seconds, multithread, _keep_at_clear, task_id)
+                else:
+                    task = RepeatTask(target, seconds, multithread, _keep_at_clear, task_id)
+                task.timer = self.timer_queue().add(
+                    seconds,
+                    lambda: self._fire_timer_task(task, event_type),
+                    interval=seconds if parsed_event_type["type"] == "repeat" else None,
                 )
-            case "repeat":
-                raise NotImplementedError("Repeat tasks is not implemented yet!")
             case _:  # All normal event types
-                task = EventTask(target, multithread, _keep_at_clear, task_id)
-        self.tasks[event_type].append(task)
+                task = EventTask(target, multithread, _keep_at_clear, task_id, capture)
+        task.event_type = event_type
+        registry[task_id] = task
+        self._dispatch_cache.pop(code, None)
+        bit = event_bit(event_type)
+        if not self.listener_mask & bit:
+            self.listener_mask |= bit
+            self.update_subtree_listener_mask()
         return task
 
     def find_task(self, task_id: str) -> EventTask | bool:
@@ -229,18 +532,22 @@ class EventHandling(CharmyObject):
             press_task = my_button.find_task("Button114.mouse_press.514")
 
         This shows getting the `EventTask` object of task with ID `Button114.mouse_press.514`
-        from bound tasks of `my_button`.
+        from bound tasks of `my_button`. The ID may also leave out the object, as in
+        ``"mouse_press.514"``.
 
         :return: The EventTask object of the task, or False if not found
         """
-        task_id_parsed = task_id.split(".")
-        if len(task_id_parsed) == 2:  # If is a shortened ID (without widget indicator)
-            task_id_parsed.insert(0, self.id)  # We assume that this indicates self
-        for task in self.tasks[task_id_parsed[1]]:
-            if task.id == task_id:
-                return task
-        else:
+        task_id = self._full_task_id(task_id)
+        registry = self.tasks.get(task_id.rpartition(".")[0][len(self.id) + 1 :])
+        if registry is None:
             return False
+        return registry.get(task_id, False)
+
+    def _full_task_id(self, task_id: str) -> str:
+        """Prefix a task ID without the object, e.g. ``mouse_press.514``, with the ID of self."""
+        if task_id.startswith(f"{self.id}."):
+            return task_id
+        return f"{self.id}.{task_id}"
 
     def unbind(self, target_task: str | EventTask | DelayTask) -> bool:
         """To unbind the task with specified task ID.
@@ -264,24 +571,25 @@ class EventHandling(CharmyObject):
         This show unbinding all tasks under `mouse_press` and `mouse_release` event from
         `my_button`.
 
+        Unbinding a task, by ID or object, takes constant time.
+
         :param target_task: The task ID or `EventTask` to unbind.
         :return: If success
         """
         match target_task:
-            case str():  # If given an ID string
-                for task_index, task in enumerate(self.tasks[target_task]):
-                    if task.id == target_task:
-                        self.tasks[target_task].pop(task_index)
-                        return True
-                else:
+            case str() if target_task.endswith(".*"):  # All tasks of an event type
+                event_type = self._full_task_id(target_task)[len(self.id) + 1 : -2]
+                registry = self.tasks.get(event_type)
+                if not registry:
                     return False
+                for task in list(registry.values()):
+                    self._remove_task(task)
+                return True
+            case str():  # If given an ID string
+                task = self.find_task(target_task)
+                return task is not False and self._remove_task(task)
             case EventTask():
-                for event_type in self.tasks:
-                    if target_task in self.tasks[event_type]:
-                        self.tasks[event_type].remove(target_task)
-                        return True
-                else:
-                    return False
+                return self._remove_task(target_task)
             case _:
                 warnings.warn(
                     "Wrong type for unbind()! Must be event ID or task object",
@@ -289,6 +597,28 @@ class EventHandling(CharmyObject):
                 )
                 return False
 
+    def unbind_all(self) -> None:
+        """Unbind every task, cancelling the timers of delay and repeat tasks.
+
+        Timers refer to their object, so call it when an object is destroyed to let it be freed.
+        """
+        for registry in list(self.tasks.values()):
+            for task in list(registry.values()):
+                self._remove_task(task)
+
+    def _remove_task(self, task: EventTask) -> bool:
+        """Remove a bound task, cancelling its timer, and return whether it was bound."""
+        registry = self.tasks.get(task.event_type)
+        if registry is None or registry.get(task.id) is not task:
+            return False
+        del registry[task.id]
+        self._dispatch_cache.pop(event_code(task.event_type), None)
+        if isinstance(task, DelayTask):
+            self.timer_queue().cancel(task.timer)
+        if not registry:
+            self.update_listener_mask()  # Other types may still share the bit
+        return True
+
 
 class Event(CharmyObject):
     """Used to represent an event."""
@@ -317,6 +647,8 @@ class Event(CharmyObject):
         self.widget: typing.Optional[typing.Any] = widget  # Relating widget
         self.window_base: typing.Optional[typing.Any] = None  # WindowBase of the current window
         self.window: typing.Optional[typing.Any] = None  # Current window
+        self.current_widget: typing.Optional[typing.Any] = None  # Running its tasks when routed
+        self.is_propagation_stopped: bool = False
         self.event_data: dict = {}
         # Not all properties above will be used
         # Update stuff from args into attributes
@@ -333,10 +665,202 @@ class Event(CharmyObject):
         else:
             return None  # If no such item avail, returns None
 
+    def stop_propagation(self) -> None:
+        """Keep a routed event from reaching the next widgets on its path."""
+        self.is_propagation_stopped = True
+
 
 Event.latest = Event(widget=None, event_type="NO_EVENT")
 
 
+# region Typed events
+
+
+class TypedEvent:
+    """Base class of the lightweight events sent by UI frameworks at high rates.
+
+    Unlike `Event`, a typed event is not a `CharmyObject`: creating one does not go through
+    the instance-counting metaclass, and its items are stored in ``__slots__`` instead of a
+    ``__dict__`` and an ``event_data`` dict. Items are still read and written like those of
+    `Event`, ``event["x"]``, and also as attributes, ``event.x``. Items outside `FIELDS` are
+    kept in a dict created on first use.
+
+    Example
+    -------
+    .. code-block:: python
+
+        event = MouseEvent(window, "mouse_move", x=10, y=20)
+        event["x"], event.y, event["missing"]  # 10, 20, None
+    """
+
+    __slots__ = (
+        "event_type",
+        "widget",
+        "window_base",
+        "window",
+        "current_widget",
+        "is_propagation_stopped",
+        "_extra",
+    )
+    FIELDS: tuple[str, ...] = ()  # Items stored in slots
+
+    def __init__(
+        self, widget: EventHandling | None = None, event_type: str = "[Unspecified]", **kwargs
+    ):
+        self.event_type: str = event_type  # Type of event
+        self.widget: typing.Optional[typing.Any] = widget  # Relating widget
+        self.window_base: typing.Optional[typing.Any] = None  # WindowBase of the current window
+        self.window: typing.Optional[typing.Any] = None  # Current window
+        self.current_widget: typing.Optional[typing.Any] = None  # Running its tasks when routed
+        self.is_propagation_stopped: bool = False
+        self._extra: dict | None = None  # Items outside `FIELDS`
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def __setitem__(self, key: str, value: typing.Any):
+        if key in self.FIELDS:
+            setattr(self, key, value)
+        elif self._extra is None:
+            self._extra = {key: value}
+        else:
+            self._extra[key] = value
+
+    def __getitem__(self, key: str) -> typing.Any:
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if self._extra is not None:
+            return self._extra.get(key)
+        return None  # If no such item avail, returns None
+
+    def stop_propagation(self) -> None:
+        """Keep a routed event from reaching the next widgets on its path."""
+        self.is_propagation_stopped = True
+
+    @property
+    def event_data(self) -> dict:
+        """Return all items as a dict, like `Event.event_data` (a copy, not a view)."""
+        data = {key: getattr(self, key) for key in self.FIELDS}
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+
+class MouseEvent(TypedEvent):
+    """Mouse events: ``mouse_move``, ``mouse_press``, ``mouse_release``, ``mouse_enter``..."""
+
+    __slots__ = FIELDS = ("x", "y", "canvas_x", "canvas_y", "button", "mods")
+
+    def __init__(
+        self,
+        widget: EventHandling | None = None,
+        event_type: str = "mouse_move",
+        x: int | float | None = None,
+        y: int | float | None = None,
+        canvas_x: int | float | None = None,
+        canvas_y: int | float | None = None,
+        button: str | None = None,
+        mods: str | None = None,
+        **kwargs,
+    ):
+        super().__init__(widget, event_type, **kwargs)
+        self.x = x
+        self.y = y
+        self.canvas_x = canvas_x
+        self.canvas_y = canvas_y
+        self.button = button
+        self.mods = mods
+
+
+class KeyEvent(TypedEvent):
+    """Key events: ``key_press``, ``key_release``, ``key_repeat`` and ``char``."""
+
+    __slots__ = FIELDS = ("key", "scancode", "mods", "char")
+
+    def __init__(
+        self,
+        widget: EventHandling | None = None,
+        event_type: str = "key_press",
+        key: int | str | None = None,
+        scancode: int | None = None,
+        mods: str | None = None,
+        char: str | None = None,
+        **kwargs,
+    ):
+        super().__init__(widget, event_type, **kwargs)
+        self.key = key
+        self.scancode = scancode
+        self.mods = mods
+        self.char = char
+
+
+class ResizeEvent(TypedEvent):
+    """The ``resize`` event of a window."""
+
+    __slots__ = FIELDS = ("width", "height")
+
+    def __init__(
+        self,
+        widget: EventHandling | None = None,
+        event_type: str = "resize",
+        width: int | None = None,
+        height: int | None = None,
+        **kwargs,
+    ):
+        super().__init__(widget, event_type, **kwargs)
+        self.width = width
+        self.height = height
+
+
+class MoveEvent(TypedEvent):
+    """The ``move`` event of a window."""
+
+    __slots__ = FIELDS = ("x_root", "y_root")
+
+    def __init__(
+        self,
+        widget: EventHandling | None = None,
+        event_type: str = "move",
+        x_root: int | None = None,
+        y_root: int | None = None,
+        **kwargs,
+    ):
+        super().__init__(widget, event_type, **kwargs)
+        self.x_root = x_root
+        self.y_root = y_root
+
+
+TYPED_EVENTS: dict[str, type[TypedEvent]] = {
+    "mouse_move": MouseEvent,
+    "mouse_enter": MouseEvent,
+    "mouse_leave": MouseEvent,
+    "mouse_press": MouseEvent,
+    "mouse_release": MouseEvent,
+    "click": MouseEvent,
+    "double_click": MouseEvent,
+    "key_press": KeyEvent,
+    "key_release": KeyEvent,
+    "key_repeat": KeyEvent,
+    "char": KeyEvent,
+    "resize": ResizeEvent,
+    "move": MoveEvent,
+}
+
+
+def make_event(widget: EventHandling | None, event_type: str, **kwargs) -> Event | TypedEvent:
+    """Create an event of the typed class matching its type, or an `Event` for other types.
+
+    Args:
+        widget: The widget of the event.
+        event_type: Type of the event, e.g. ``"mouse_move"``.
+        **kwargs: Items of the event.
+    """
+    event_class = TYPED_EVENTS.get(parse_event_type(event_type)[0], Event)
+    return event_class(widget, event_type, **kwargs)
+
+
+# endregion
+
+
 class EventTask:
     """A class to represent event task when an event is triggered."""
 
@@ -346,6 +870,7 @@ class EventTask:
         multithread: bool = False,
         _keep_at_clear: bool = False,
         id_: str | int | typing.Literal[ID.AUTO] = ID.AUTO,
+        capture: bool = False,
     ):
         """Each object is to represent a task bound to the event.
 
@@ -367,48 +892,155 @@ class EventTask:
         :param multithread: If this task should be executed in another thread (False by default)
         :param _keep_at_clear: If the task should be kept when cleaning the event's binding
         :param id_: The task id of this task
+        :param capture: If this task runs in the capture phase of routed events
         """
         self.id: str | int | typing.Literal[ID.AUTO] = id_
         self.target: typing.Callable | typing.Iterable = target
         self.multithread: bool = multithread
         self.keep_at_clear: bool = _keep_at_clear
+        self.capture: bool = capture
+        self.event_type: str | None = None  # Set when bound
 
 
 class DelayTask(EventTask):
-    NotImplemented  # NOQA
+    """A task executed once after a delay, bound with ``delay[seconds]``.
 
+    It is unbound right after being executed.
 
-class WorkingThread(threading.Thread, CharmyObject):
-    """CWorkingThread is a class represent the event working thread."""
+    :param target: A callable thing, what to do when this task is executed
+    :param delay: Seconds before the task is executed
+    :param multithread: If this task should be executed in another thread (False by default)
+    :param _keep_at_clear: If the task should be kept when cleaning the event's binding
+    :param id_: The task id of this task
+    """
 
-    def __init__(self, *args, **kwargs):
-        threading.Thread.__init__(self, *args, **kwargs)
-        CharmyObject.__init__(self, id_="event.main_thread")
-        self.tasks: list[tuple[Event, EventTask | DelayTask]] = []  # [(event, task), ...]
+    def __init__(
+        self,
+        target: typing.Callable | typing.Iterable,
+        delay: float,
+        multithread: bool = False,
+        _keep_at_clear: bool = False,
+        id_: str | int | typing.Literal[ID.AUTO] = ID.AUTO,
+    ):
+        super().__init__(target, multithread, _keep_at_clear, id_)
+        self.delay: float = delay
+        self.timer: Timer | None = None  # Set by `EventHandling.bind()`
+
+
+class RepeatTask(DelayTask):
+    """A task executed every ``interval`` seconds until unbound, bound with ``repeat[seconds]``.
+
+    :param target: A callable thing, what to do when this task is executed
+    :param interval: Seconds between two executions
+    :param multithread: If this task should be executed in another thread (False by default)
+    :param _keep_at_clear: If the task should be kept when cleaning the event's binding
+    :param id_: The task id of this task
+    """
+
+    @property
+    def interval(self) -> float:
+        """Return the seconds between two executions."""
+        return self.delay
+
+
+class WorkingThread(CharmyObject):
+    """WorkingThread runs the tasks bound with ``multithread=True`` in a pool of worker threads.
+
+    Tasks are handed to a `concurrent.futures.ThreadPoolExecutor`, whose workers block on its
+    queue, so a task starts as soon as a worker is free instead of on the next polling round.
+    At most ``max_pending`` tasks may be queued or running: beyond that, `add_task()` rejects
+    new tasks, so a flood of events cannot grow the queue without bound. Tasks are added from
+    input callbacks in the UI thread, so they are rejected at once instead of freezing the
+    window while waiting for a free slot. A rejected task is reported like a failed one.
+
+    An exception raised by a task is stored in its future and triggers an ``error`` event on
+    the object the task is bound to, with the items ``exception``, ``task`` and ``event``.
+    The ``error`` event runs in the worker thread. Without ``error`` handlers, a warning is
+    issued instead.
+
+    Example
+    -------
+    .. code-block:: python
+
+        widget.bind("mouse_press", save_file, multithread=True)
+        widget.bind("error", lambda event: print(event["exception"]))
+
+    Args:
+        max_workers: Number of worker threads.
+        max_pending: Maximum number of tasks queued or running.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 1024):
+        # A working thread created after the first one was shut down gets an automatic ID
+        CharmyObject.__init__(
+            self, id_="event.main_thread" if "event.main_thread" not in self.objects else ID.AUTO
+        )
+        self.max_workers: int = max_workers
+        self.max_pending: int = max_pending
         self.is_alive: bool = True
-        self.lock: threading.Lock = threading.Lock()
-
-    def execute_tasks(self):
-        self.lock.acquire()
-        for task in self.tasks:
-            if callable(task[1].target):
-                task[1].target(task[0])
-            elif isinstance(task[1], collections.abc.Iterable):
-                # Function list
-                for func in task[1]:
-                    func(task[0])
-            self.tasks.remove(task)
-        else:
-            # warnings.warn("")
-            pass
-        self.lock.release()
-
-    def run(self):
-        while self.is_alive:
-            self.execute_tasks()
-            if len(self.tasks) == 0:
-                # If idle, then rest for 0.02s to save CPU time
-                time.sleep(0.02)
-
-    def add_task(self, task: EventTask | DelayTask, event: Event):
-        self.tasks.append((event, task))
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="charmy-worker"
+        )
+        self.pending = threading.BoundedSemaphore(max_pending)  # Backpressure
+        EventHandling.WORKING_THREAD = self
+
+    def add_task(
+        self,
+        task: EventTask | DelayTask,
+        event: Event | TypedEvent,
+        owner: EventHandling | None = None,
+        timeout: float | None = 0.0,
+    ) -> concurrent.futures.Future:
+        """Run a task in a worker thread.
+
+        Args:
+            task: The task to run.
+            event: The event passed to the task.
+            owner: The object the task is bound to, receiving the ``error`` event if it fails.
+            timeout: Seconds to wait at most while ``max_pending`` tasks are pending, None to
+                wait without limit. Defaults to 0, reject the task at once.
+
+        Returns:
+            concurrent.futures.Future: Resolved with the result of the task, or its exception.
+            A rejected task gets a future failed with `TimeoutError`, and an ``error`` event.
+
+        Raises:
+            RuntimeError: If the working thread is shut down.
+        """
+        if not self.is_alive:
+            raise RuntimeError("The working thread is shut down")
+        if not self.pending.acquire(timeout=timeout):
+            error = TimeoutError(
+                f"Task {task.id} rejected, {self.max_pending} multithread tasks are pending"
+            )
+            EventHandling.report_task_error(owner, error, task, event, "Multithread task")
+            future = concurrent.futures.Future()
+            future.set_exception(error)
+            return future
+        try:
+            future = self.executor.submit(self._run_task, task, event, owner)
+        except BaseException:
+            self.pending.release()
+            raise
+        future.add_done_callback(lambda _: self.pending.release())
+        return future
+
+    def _run_task(
+        self, task: EventTask | DelayTask, event: Event | TypedEvent, owner: EventHandling | None
+    ) -> None:
+        """Run a task in a worker thread, reporting its exception."""
+        try:
+            EventHandling._execute_task(task, event)
+        except Exception as e:
+            EventHandling.report_task_error(owner, e, task, event, "Multithread task")
+            raise
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        """Stop accepting tasks and release the worker threads.
+
+        Args:
+            wait: Whether to wait for the running and queued tasks to finish.
+            cancel_pending: Whether to drop the queued tasks that did not start yet.
+        """
+        self.is_alive = False
+        self.executor.shutdown(wait=wait, cancel_futures=cancel_pending)
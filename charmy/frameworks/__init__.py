@@ -1,15 +1,38 @@
+from functools import cached_property
 from os import environ
 
 from .ui import window_framework_map
 from .drawing import drawing_framework_map
 from .backend import backend_framework_map
 from ..const import Drawing, UI, Backends
+from ..profiling import startup_timings
 
 
 class Frameworks:
+    """The frameworks selected by the environment variables.
+
+    Frameworks are imported and created on first use, so importing charmy does not load skia,
+    glfw or PyOpenGL.
+    """
+
     drawing_name = environ.get("CHARMY_DRAWING_BACKEND", Drawing.SKIA)
-    drawing = drawing_framework_map[drawing_name]()
     ui_name = environ.get("CHARMY_UI_BACKEND", UI.GLFW)
-    ui = window_framework_map[ui_name]()
-    backend_name = environ.get("CHARMY_BACKEND", Backends.OPENGL)
-    backend = backend_framework_map[backend_name]()
+    # Headless windows have no GL context, so they draw with the CPU by default
+    backend_name = environ.get(
+        "CHARMY_BACKEND", Backends.RASTER if ui_name == UI.HEADLESS else Backends.OPENGL
+    )
+
+    @cached_property
+    def drawing(self):
+        with startup_timings.phase(f"frameworks.drawing ({self.drawing_name})"):
+            return drawing_framework_map[self.drawing_name]()
+
+    @cached_property
+    def ui(self):
+        with startup_timings.phase(f"frameworks.ui ({self.ui_name})"):
+            return window_framework_map[self.ui_name]()
+
+    @cached_property
+    def backend(self):
+        with startup_timings.phase(f"frameworks.backend ({self.backend_name})"):
+            return backend_framework_map[self.backend_name]()
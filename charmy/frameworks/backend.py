@@ -16,7 +16,14 @@ class OPENGL(BackendFramework):
         self.opengl_GL = importlib.import_module("OpenGL.GL")
 
 
+class RASTER(BackendFramework):
+    """Draw on the CPU into in-memory surfaces, needing neither a GPU nor a display."""
+
+    ...
+
+
 if importlib.util.find_spec("OpenGL") is not None:
     backend_framework_map["OPENGL"] = OPENGL  # NOQA
+backend_framework_map["RASTER"] = RASTER  # NOQA
 
 # endregion
@@ -1,4 +1,6 @@
+import collections
 import importlib.util
+import typing
 from abc import ABC, abstractmethod
 
 from ..rect import Rect
@@ -9,7 +11,9 @@ class DrawingFramework(ABC):
     """The base class of DrawingFramework."""
 
     @abstractmethod
-    def draw_rect(self, canvas, rect: Rect, radius: int = 0, bg=None, bd=None):
+    def draw_rect(
+        self, canvas, rect: Rect, radius: int = 0, bg=None, bd=None, bd_width: int | float = 1
+    ):
         """Draw a rectangle
 
         Args:
@@ -18,6 +22,82 @@ class DrawingFramework(ABC):
             radius (int, optional): The radius of the rectangle. Defaults to 0.
             bg (charmy.styles.color.Color, optional): The background color of the rectangle. Defaults to None.
             bd (charmy.styles.color.Color, optional): The border color of the rectangle. Defaults to None.
+            bd_width (int | float, optional): The width of the border. Defaults to 1.
+        """
+        ...
+
+    @abstractmethod
+    def draw_rects(self, canvas, batch):
+        """Draw all rectangles of a batch in bulk
+
+        Args:
+            canvas (Canvas): The canvas to draw
+            batch (charmy.batch.RectBatch): The rectangles to draw
+        """
+        ...
+
+    @abstractmethod
+    def draw_rect_array(self, canvas, rects, color: int, anti_alias: bool = False):
+        """Fill all rectangles of a `RectArray` with one color at once
+
+        Args:
+            canvas (Canvas): The canvas to draw
+            rects (charmy.rect.RectArray): The rectangles to draw, read from `RectArray.ltrb`
+            color (int): The packed ARGB color of the rectangles
+            anti_alias (bool, optional): Whether to anti-alias the edges. Defaults to False.
+        """
+        ...
+
+    @abstractmethod
+    def record(self, bounds: Rect, draw_func: typing.Callable[[typing.Any], None]):
+        """Record drawing commands into a replayable display list
+
+        Args:
+            bounds (Rect): The area the recorded commands draw into
+            draw_func (Callable): Called with a recording canvas to issue the commands
+
+        Returns:
+            The display list, to be passed to `draw_picture()`
+        """
+        ...
+
+    @abstractmethod
+    def draw_picture(self, canvas, picture):
+        """Replay a display list made by `record()`
+
+        Args:
+            canvas (Canvas): The canvas to draw
+            picture: The display list to replay
+        """
+        ...
+
+    @abstractmethod
+    def make_color(self, r: int, g: int, b: int, a: int = 255):
+        """Make a color object from its components
+
+        Args:
+            r (int): The red component of the color (0-255)
+            g (int): The green component of the color (0-255)
+            b (int): The blue component of the color (0-255)
+            a (int, optional): The alpha component of the color (0-255). Defaults to 255.
+
+        Returns:
+            The color object of this framework
+        """
+        ...
+
+    @abstractmethod
+    def named_color(self, name: str):
+        """Look up a predefined color by name
+
+        Args:
+            name (str): The color name, e.g. "white"
+
+        Returns:
+            The color object of this framework
+
+        Raises:
+            ValueError: When the color does not exist
         """
         ...
 
@@ -26,25 +106,515 @@ drawing_framework_map = {}
 
 
 class SKIA(DrawingFramework):
+    """Drawing framework based on skia-python.
+
+    Paints are looked up in an LRU cache shared by all windows, keyed on their resolved style,
+    so drawing many identically styled shapes does not allocate a new `skia.Paint` each time.
+    Cached paints are shared and must not be modified.
+    """
+
+    paint_cache: collections.OrderedDict[tuple, typing.Any] = collections.OrderedDict()
+    paint_cache_capacity: int = 512
+    paint_cache_hits: int = 0
+    paint_cache_misses: int = 0
+
     def __init__(self):
         self.skia = importlib.import_module("skia")
 
-    def draw_rect(self, canvas, rect: Rect, radius: int | float = 8, bg=None, bd=None):  # noqa
-        # from skia import RRect, Rect, Canvas, Paint
-        # Paint()
-        # canvas: Canvas
+    def make_color(self, r: int, g: int, b: int, a: int = 255):
+        return self.skia.ColorSetARGB(a, r, g, b)
+
+    def named_color(self, name: str):
+        try:
+            return getattr(self.skia, f"Color{name.upper()}")
+        except AttributeError:
+            raise ValueError(f"Unknown color name: {name}") from None
 
+    def get_paint(
+        self,
+        color: int,
+        style: str = "fill",
+        stroke_width: int | float = 0,
+        anti_alias: bool = True,
+        shader=None,
+    ):
+        """Return a paint of the given style, from the paint cache when possible.
+
+        Args:
+            color (int): The skia color of the paint.
+            style (str, optional): "fill", "stroke" or "stroke_and_fill". Defaults to "fill".
+            stroke_width (int | float, optional): The stroke width. Defaults to 0.
+            anti_alias (bool, optional): Whether to anti-alias. Defaults to True.
+            shader (skia.Shader, optional): The shader of the paint. Defaults to None.
+
+        Returns:
+            skia.Paint: The shared paint, which must not be modified.
+        """
+        key = (color, style, stroke_width, anti_alias, shader)
+        cache = SKIA.paint_cache
+        paint = cache.get(key)
+        if paint is not None:
+            SKIA.paint_cache_hits += 1
+            cache.move_to_end(key)
+            return paint
+
+        SKIA.paint_cache_misses += 1
+        match style:
+            case "fill":
+                paint_style = self.skia.Paint.kFill_Style
+            case "stroke":
+                paint_style = self.skia.Paint.kStroke_Style
+            case "stroke_and_fill":
+                paint_style = self.skia.Paint.kStrokeAndFill_Style
+            case _:
+                raise ValueError(f"Unknown paint style: {style}")
+        paint = self.skia.Paint(
+            Color=color,
+            Style=paint_style,
+            StrokeWidth=stroke_width,
+            AntiAlias=anti_alias,
+        )
+        if shader is not None:
+            paint.setShader(shader)
+        cache[key] = paint
+        if len(cache) > SKIA.paint_cache_capacity:
+            cache.popitem(last=False)  # Evict the least recently used paint
+        return paint
+
+    @classmethod
+    def paint_cache_stats(cls) -> dict[str, int | float]:
+        """Return the size and hit rate of the paint cache.
+
+        Returns:
+            dict[str, int | float]: e.g. ``{"size": 3, "capacity": 512, "hits": 997,
+            "misses": 3, "hit_rate": 0.997}``
+        """
+        lookups = cls.paint_cache_hits + cls.paint_cache_misses
+        return {
+            "size": len(cls.paint_cache),
+            "capacity": cls.paint_cache_capacity,
+            "hits": cls.paint_cache_hits,
+            "misses": cls.paint_cache_misses,
+            "hit_rate": cls.paint_cache_hits / lookups if lookups else 0.0,
+        }
+
+    @classmethod
+    def clear_paint_cache(cls) -> None:
+        """Empty the paint cache and reset its counters."""
+        cls.paint_cache.clear()
+        cls.paint_cache_hits = 0
+        cls.paint_cache_misses = 0
+
+    def draw_rect(
+        self,
+        canvas,
+        rect: Rect,
+        radius: int | float = 8,
+        bg=None,
+        bd=None,
+        bd_width: int | float = 1,
+    ):  # noqa
         if bg is None:
             bg = {}
-        canvas.drawRoundRect(
-            rect=self.skia.Rect.MakeXYWH(rect.x, rect.y, rect.width, rect.height),
-            rx=radius,
-            ry=radius,
-            paint=self.skia.Paint(
-                Color=bg.get("color_object", self.skia.ColorBLACK),
-                Style=self.skia.Paint.kFill_Style,
+        skia_rect = self.skia.Rect.MakeXYWH(rect.x, rect.y, rect.width, rect.height)
+        paint = self.get_paint(bg.get("color_object", self.skia.ColorBLACK))
+        if radius:
+            canvas.drawRoundRect(skia_rect, radius, radius, paint)
+        else:
+            canvas.drawRect(skia_rect, paint)
+
+        if bd is not None:
+            # Keep the border inside `rect`, as a stroke is centered on its path
+            inset = bd_width / 2
+            skia_rect.inset(inset, inset)
+            paint = self.get_paint(
+                bd.get("color_object", self.skia.ColorBLACK), "stroke", bd_width
+            )
+            if radius:
+                canvas.drawRoundRect(skia_rect, radius - inset, radius - inset, paint)
+            else:
+                canvas.drawRect(skia_rect, paint)
+
+    def draw_rects(self, canvas, batch):
+        # One path per color group, so a batch costs one or two draw calls per color. Paths are
+        # kept in the batch and only rebuilt for the color groups changed since the last draw.
+        # Plain rectangles are filled without anti-aliasing, which is several times faster for
+        # paths made of many rectangles; rounded ones are kept in a separate, anti-aliased path.
+        # An ordered batch keeps one pair of paths per run of rows sharing a color instead, all
+        # rebuilt on any change, as a change can split or merge runs.
+        cache = batch.draw_cache
+        dirty_colors = batch.take_dirty_colors()
+        if dirty_colors is None or (batch.ordered and dirty_colors):
+            cache.clear()
+            dirty_colors = None
+        if dirty_colors is None or dirty_colors:
+            if batch.ordered:
+                groups = ((index, run) for index, run in enumerate(batch.runs()))
+            else:
+                groups = ((color, (color, rows)) for color, rows in batch.groups(dirty_colors))
+            for key, (color, rows) in groups:
+                if not len(rows):
+                    cache.pop(key, None)
+                    continue
+                is_round = rows["radius"] > 0
+                cache[key] = (
+                    color,
+                    self._rects_path(batch.numpy, rows[~is_round]),
+                    self._round_rects_path(batch.numpy, rows[is_round]),
+                )
+
+        for color, rect_path, round_path in cache.values():
+            if rect_path is not None:
+                canvas.drawPath(rect_path, self.get_paint(color, anti_alias=False))
+            if round_path is not None:
+                canvas.drawPath(round_path, self.get_paint(color))
+
+    # Header of `Path.writeToMemory()`: format version 5, winding fill type
+    _PATH_SERIAL_VERSION = 5
+
+    def _make_path(self, numpy, points, verbs, weights):
+        """Build a path from NumPy arrays of points (n, 2), verbs and conic weights at once.
+
+        The arrays are laid out in the format of `Path.writeToMemory()`, read back in one call.
+        Should skia reject it, e.g. after a format change, the path is built by `Path.Make()`,
+        which converts the points one by one and is several times slower.
+        """
+        points = numpy.ascontiguousarray(points, dtype="<f4")
+        header = numpy.array(
+            [self._PATH_SERIAL_VERSION, len(points), len(weights), len(verbs)], dtype="<i4"
+        )
+        data = b"".join(
+            (
+                header.tobytes(),
+                points.tobytes(),
+                weights.astype("<f4").tobytes(),
+                verbs.astype("u1").tobytes(),
+                bytes(-len(verbs) % 4),  # Padded to 4 bytes
+            )
+        )
+        path = self.skia.Path()
+        if path.readFromMemory(data):
+            return path
+        # A structured view turns into a list of (x, y) tuples, converted to points by skia
+        point_tuples = points.view([("x", "<f4"), ("y", "<f4")]).ravel().tolist()
+        return self.skia.Path.Make(
+            point_tuples, verbs.tolist(), weights.tolist(), self.skia.PathFillType.kWinding
+        )
+
+    def draw_rect_array(self, canvas, rects, color: int, anti_alias: bool = False):
+        # The corners are computed from the (left, top, right, bottom) columns of `ltrb`, the
+        # array itself is not copied
+        if not len(rects):
+            return
+        left, top, right, bottom = rects.ltrb.T
+        path = self._ltrb_path(rects.numpy, left, top, right, bottom)
+        canvas.drawPath(path, self.get_paint(color, anti_alias=anti_alias))
+
+    def _rects_path(self, numpy, rows):
+        """Return a path of rectangles for batch rows, None if there is none."""
+        if not len(rows):
+            return None
+        left, top = rows["x"], rows["y"]
+        return self._ltrb_path(numpy, left, top, left + rows["w"], top + rows["h"])
+
+    def _ltrb_path(self, numpy, left, top, right, bottom):
+        """Return a path of rectangles given by arrays of their edges."""
+        # Each rectangle: move, 3 lines, close
+        points = numpy.stack(
+            [left, top, right, top, right, bottom, left, bottom], axis=1
+        ).reshape(-1, 2)
+        verbs = numpy.tile(
+            numpy.array(
+                [
+                    self.skia.Path.kMove_Verb,
+                    self.skia.Path.kLine_Verb,
+                    self.skia.Path.kLine_Verb,
+                    self.skia.Path.kLine_Verb,
+                    self.skia.Path.kClose_Verb,
+                ],
+                dtype="u1",
             ),
+            len(left),
+        )
+        return self._make_path(numpy, points, verbs, numpy.empty(0, dtype="f4"))
+
+    def _round_rects_path(self, numpy, rows):
+        """Return a path of rounded rectangles for batch rows, None if there is none."""
+        if not len(rows):
+            return None
+        left, top = rows["x"], rows["y"]
+        right, bottom = left + rows["w"], top + rows["h"]
+        # Radii larger than half a side are clamped, like `Path.addRoundRect()` does
+        radius = numpy.minimum(rows["radius"], numpy.minimum(rows["w"], rows["h"]) / 2)
+        # Each rectangle: move, then a line and a quarter-circle conic per side, close
+        points = numpy.stack(
+            [
+                left + radius, top,
+                right - radius, top, right, top, right, top + radius,
+                right, bottom - radius, right, bottom, right - radius, bottom,
+                left + radius, bottom, left, bottom, left, bottom - radius,
+                left, top + radius, left, top, left + radius, top,
+            ],
+            axis=1,
+        ).reshape(-1, 2)  # fmt: skip
+        line, conic = self.skia.Path.kLine_Verb, self.skia.Path.kConic_Verb
+        verbs = numpy.tile(
+            numpy.array(
+                [self.skia.Path.kMove_Verb, line, conic, line, conic, line, conic, line, conic]
+                + [self.skia.Path.kClose_Verb],
+                dtype="u1",
+            ),
+            len(rows),
+        )
+        weights = numpy.full(4 * len(rows), numpy.sqrt(0.5), dtype="f4")
+        return self._make_path(numpy, points, verbs, weights)
+
+    def record(self, bounds: Rect, draw_func: typing.Callable[[typing.Any], None]):
+        recorder = self.skia.PictureRecorder()
+        draw_func(
+            recorder.beginRecording(
+                self.skia.Rect.MakeLTRB(bounds.left, bounds.top, bounds.right, bounds.bottom)
+            )
+        )
+        return recorder.finishRecordingAsPicture()
+
+    def draw_picture(self, canvas, picture):
+        canvas.drawPicture(picture)
+
+
+class SkiaGLRenderTarget:
+    """Keeps a window's Skia GPU context and surface alive between frames.
+
+    The ``GrDirectContext`` is created once, on the first frame, and the surface is only
+    rebuilt when the framebuffer size changes, so Skia's glyph, path and texture caches stay
+    warm. The ``*_hits`` / ``*_misses`` counters show whether a frame reused the existing GPU
+    objects or had to allocate new ones.
+
+    Args:
+        skia: The imported ``skia`` module.
+        opengl_GL: The imported ``OpenGL.GL`` module.
+        cache_limit: Byte limit of Skia's GPU resource cache.
+    """
+
+    def __init__(self, skia, opengl_GL, cache_limit: int = 16 * 1024 * 1024):
+        self.skia = skia
+        self.opengl_GL = opengl_GL
+        self.cache_limit: int = cache_limit
+
+        self.context = None  # skia.GrDirectContext
+        self.backend_render_target = None  # skia.GrBackendRenderTarget
+        self.surface = None  # skia.Surface
+        self.size: tuple[int, int] = (0, 0)  # Framebuffer size of `surface`
+        self.backing_surface = None  # skia.Surface, offscreen copy of the last frame
+
+        self.context_hits: int = 0
+        self.context_misses: int = 0
+        self.surface_hits: int = 0
+        self.surface_misses: int = 0
+
+    def get_context(self):
+        """Return the GPU context, creating it on first use.
+
+        The GL context of the window must be current.
+        """
+        if self.context is None:
+            self.context_misses += 1
+            self.context = self.skia.GrDirectContext.MakeGL()
+            if self.context is None:
+                raise RuntimeError("Failed to create Skia GrDirectContext")
+            self.context.setResourceCacheLimit(self.cache_limit)
+        else:
+            self.context_hits += 1
+        return self.context
+
+    def get_surface(self, width: int, height: int):
+        """Return the surface of the framebuffer, rebuilding it only if its size changed.
+
+        Args:
+            width: Framebuffer width in pixels.
+            height: Framebuffer height in pixels.
+
+        Returns:
+            skia.Surface: Surface drawing into the default framebuffer.
+        """
+        context = self.get_context()
+        if self.surface is not None and self.size == (width, height):
+            self.surface_hits += 1
+            return self.surface
+
+        self.surface_misses += 1
+        self.surface = None  # Drop the old surface before allocating the new one
+        self.backend_render_target = self.skia.GrBackendRenderTarget(
+            width,
+            height,
+            0,
+            0,
+            self.skia.GrGLFramebufferInfo(0, self.opengl_GL.GL_RGBA8),
+        )
+        self.surface = self.skia.Surface.MakeFromBackendRenderTarget(
+            context,
+            self.backend_render_target,
+            self.skia.kBottomLeft_GrSurfaceOrigin,
+            self.skia.kRGBA_8888_ColorType,
+            self.skia.ColorSpace.MakeSRGB(),
         )
+        if self.surface is None:
+            raise RuntimeError("Failed to create Skia surface")
+        self.size = (width, height)
+        return self.surface
+
+    def get_backing_surface(self) -> tuple[typing.Any, bool]:
+        """Return the offscreen surface that keeps the content of the previous frames.
+
+        The default framebuffer is undefined after a buffer swap, so partial redraws go to this
+        surface, which is then copied to the window. It is created on the same GPU context as
+        `surface` and rebuilt together with it.
+
+        Returns:
+            tuple[skia.Surface, bool]: The backing surface, and whether it was just (re)created
+            and therefore has to be fully redrawn.
+        """
+        if self.backing_surface is not None and (
+            self.backing_surface.width(),
+            self.backing_surface.height(),
+        ) == self.size:
+            return self.backing_surface, False
+
+        self.backing_surface = self.surface.makeSurface(*self.size)
+        if self.backing_surface is None:
+            raise RuntimeError("Failed to create Skia backing surface")
+        return self.backing_surface, True
+
+    def snapshot(self):
+        """Return the last frame drawn in RETAINED mode as a `skia.Image`, or None.
+
+        The default framebuffer is undefined after a buffer swap, so only the backing surface
+        can be read back.
+        """
+        if self.backing_surface is None:
+            return None
+        return self.backing_surface.makeImageSnapshot()
+
+    def stats(self) -> dict[str, int]:
+        """Return the hit / miss counters and the purgeable bytes of the resource cache.
+
+        Returns:
+            dict[str, int]: Counters, e.g. ``{"surface_hits": 120, "surface_misses": 1, ...}``
+        """
+        stats = {
+            "context_hits": self.context_hits,
+            "context_misses": self.context_misses,
+            "surface_hits": self.surface_hits,
+            "surface_misses": self.surface_misses,
+            "resource_cache_purgeable_bytes": 0,
+        }
+        if self.context is not None:
+            stats["resource_cache_purgeable_bytes"] = self.context.getResourceCachePurgeableBytes()
+        return stats
+
+    def release(self):
+        """Release the surfaces and abandon the GPU context.
+
+        The GL context of the window must be current.
+        """
+        self.backing_surface = None
+        self.surface = None
+        self.backend_render_target = None
+        if self.context is not None:
+            self.context.freeGpuResources()
+            self.context.releaseResourcesAndAbandonContext()
+            self.context = None
+        self.size = (0, 0)
+
+
+class SkiaRasterRenderTarget:
+    """Keeps a window's Skia raster surface alive between frames.
+
+    It has the interface of `SkiaGLRenderTarget`, but draws on the CPU into memory, so it needs
+    neither a GPU nor a display. The last frame can be read back with `snapshot()`.
+
+    Args:
+        skia: The imported ``skia`` module.
+    """
+
+    def __init__(self, skia):
+        self.skia = skia
+
+        self.context = None  # Always None, there is no GPU context
+        self.surface = None  # skia.Surface
+        self.size: tuple[int, int] = (0, 0)  # Size of `surface`
+        self.backing_surface = None  # skia.Surface, offscreen copy of the last frame
+
+        self.surface_hits: int = 0
+        self.surface_misses: int = 0
+
+    def get_context(self) -> None:
+        """Return None, raster surfaces have no GPU context."""
+        return None
+
+    def get_surface(self, width: int, height: int):
+        """Return the surface of the window, rebuilding it only if its size changed.
+
+        Args:
+            width: Width in pixels.
+            height: Height in pixels.
+
+        Returns:
+            skia.Surface: An in-memory N32 premultiplied surface.
+        """
+        if self.surface is not None and self.size == (width, height):
+            self.surface_hits += 1
+            return self.surface
+
+        self.surface_misses += 1
+        self.surface = None
+        self.surface = self.skia.Surface.MakeRaster(
+            self.skia.ImageInfo.MakeN32Premul(max(1, width), max(1, height))
+        )
+        if self.surface is None:
+            raise RuntimeError("Failed to create Skia raster surface")
+        self.size = (width, height)
+        return self.surface
+
+    def get_backing_surface(self) -> tuple[typing.Any, bool]:
+        """Return the offscreen surface that keeps the content of the previous frames.
+
+        Returns:
+            tuple[skia.Surface, bool]: The backing surface, and whether it was just (re)created
+            and therefore has to be fully redrawn.
+        """
+        if self.backing_surface is not None and (
+            self.backing_surface.width(),
+            self.backing_surface.height(),
+        ) == (self.surface.width(), self.surface.height()):
+            return self.backing_surface, False
+
+        self.backing_surface = self.surface.makeSurface(
+            self.surface.width(), self.surface.height()
+        )
+        if self.backing_surface is None:
+            raise RuntimeError("Failed to create Skia backing surface")
+        return self.backing_surface, True
+
+    def snapshot(self):
+        """Return the last drawn frame as a `skia.Image`, or None if nothing was drawn."""
+        if self.surface is None:
+            return None
+        return self.surface.makeImageSnapshot()
+
+    def stats(self) -> dict[str, int]:
+        """Return the hit / miss counters of the surface.
+
+        Returns:
+            dict[str, int]: Counters, e.g. ``{"surface_hits": 120, "surface_misses": 1}``
+        """
+        return {"surface_hits": self.surface_hits, "surface_misses": self.surface_misses}
+
+    def release(self):
+        """Release the surfaces."""
+        self.backing_surface = None
+        self.surface = None
+        self.size = (0, 0)
 
 
 if importlib.util.find_spec("skia") is not None:
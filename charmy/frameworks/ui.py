@@ -1,9 +1,11 @@
+import collections
 import importlib.util
+import threading
 import typing
 from abc import ABC, abstractmethod
 
 from ..const import PLATFORM
-from ..event import Event
+from ..event import MouseEvent, MoveEvent, ResizeEvent, event_bit, make_event, trigger_mask
 from ..pos import Pos
 from ..size import Size
 
@@ -128,6 +130,43 @@ class UIFramework(ABC):
         """
         ...
 
+    @abstractmethod
+    def get_framebuffer_size(self, the_window) -> tuple[int, int]:
+        """Get the size of the framebuffer of the window, in pixels
+
+        Args:
+            the_window: The window to get framebuffer size for
+
+        Returns:
+            tuple[int, int]: The width and height of the framebuffer
+        """
+        ...
+
+    @abstractmethod
+    def can_be_closed(self, the_window) -> bool:
+        """Get whether the window was asked to close
+
+        Args:
+            the_window: The window to check
+
+        Returns:
+            bool: Whether the window should close
+        """
+        ...
+
+    @abstractmethod
+    def set_should_close(self, the_window, value: bool) -> None:
+        """Set whether the window should close
+
+        Args:
+            the_window: The window to set for
+            value: Whether the window should close
+
+        Returns:
+            None
+        """
+        ...
+
     @abstractmethod
     def swap_buffers(self, the_window) -> None:
         """Swap the buffers of the window
@@ -140,6 +179,39 @@ class UIFramework(ABC):
         """
         ...
 
+    @abstractmethod
+    def swap_interval(self, is_vsync: bool) -> None:
+        """Set whether buffer swaps of the current context wait for the vertical sync
+
+        Args:
+            is_vsync: Whether to enable vsync
+
+        Returns:
+            None
+        """
+        ...
+
+    @abstractmethod
+    def wait_events(self, timeout: float | None = None) -> None:
+        """Process pending events, waiting for one if there is none
+
+        Args:
+            timeout: Seconds to wait at most, 0 to only poll, None to wait without limit
+
+        Returns:
+            None
+        """
+        ...
+
+    @abstractmethod
+    def post_empty_event(self) -> None:
+        """Wake up `wait_events()` from any thread
+
+        Returns:
+            None
+        """
+        ...
+
 
 window_framework_map = {}
 
@@ -185,7 +257,10 @@ class GLFW(UIFramework):
         self.glfw.window_hint(self.glfw.OPENGL_PROFILE, self.glfw.OPENGL_CORE_PROFILE)
 
         # create window
-        window = self.glfw.create_window(size.width, size.height, title, None, None)
+        if isinstance(size, tuple):
+            window = self.glfw.create_window(size[0], size[1], title, None, None)
+        else:
+            window = self.glfw.create_window(size.width, size.height, title, None, None)
 
         if window == None:
             raise RuntimeError("Can't create window")
@@ -205,46 +280,64 @@ class GLFW(UIFramework):
             None
         """
         # TODO: docstring?
-        # TODO: lambda + 没注释 给我请的高人看似了
-        # TODO: 函数套函数，我死了
+        # Every callback first checks the listener mask of the window, so events nobody
+        # listens to (typically mouse_move) are dropped before any object is built
+        resize_bit = event_bit("resize")
+        move_bit = event_bit("move")
+        enter_bits = event_bit("mouse_enter") | event_bit("mouse_leave")
+        mouse_move_bits = trigger_mask("mouse_move")
+        mouse_button_bits = trigger_mask("mouse_press") | trigger_mask("mouse_release")
+
+        def _resize(w, width: int, height: int):
+            """Handle resize event"""
+            if window_class.subtree_listener_mask & resize_bit:
+                window_class.handle_event(
+                    ResizeEvent(window_class, "resize", width=width, height=height)
+                )
+
         # Bind resize event
-        self.glfw.set_window_size_callback(
-            the_window,
-            lambda w, width, height: window_class.trigger(
-                Event(window_class, "resize", width=width, height=height)
-            ),
-        )
+        self.glfw.set_window_size_callback(the_window, _resize)
+
+        def _move(w, root_x: int, root_y: int):
+            """Handle move event"""
+            if window_class.subtree_listener_mask & move_bit:
+                window_class.handle_event(
+                    MoveEvent(window_class, "move", x_root=root_x, y_root=root_y)
+                )
+
         # Bind move event
-        self.glfw.set_window_pos_callback(
-            the_window,
-            lambda w, root_x, root_y: window_class.trigger(
-                Event(window_class, "move", x_root=root_x, y_root=root_y)
-            ),
-        )
+        self.glfw.set_window_pos_callback(the_window, _move)
 
         def _enter(w, entered: int):
             """Handle mouse enter/leave event"""
+            if not window_class.subtree_listener_mask & enter_bits:
+                return
             if entered:
                 event_type = "mouse_enter"
             else:
                 event_type = "mouse_leave"
-            window_class.trigger(Event(window_class, event_type, the_window=w))
+            window_class.handle_event(MouseEvent(window_class, event_type, the_window=w))
 
         # Bind move event
         self.glfw.set_cursor_enter_callback(
             the_window,
             _enter,
         )
+
+        def _mouse_move(w, x: float, y: float):
+            """Handle mouse move event"""
+            if window_class.subtree_listener_mask & mouse_move_bits:
+                window_class.handle_event(
+                    MouseEvent(window_class, "mouse_move", x=x, canvas_x=x, y=y, canvas_y=y)
+                )
+
         # Bind mouse move event
-        self.glfw.set_cursor_pos_callback(
-            the_window,
-            lambda w, x, y: window_class.trigger(
-                Event(window_class, "mouse_move", x=x, canvas_x=x, y=y, canvas_y=y)
-            ),
-        )
+        self.glfw.set_cursor_pos_callback(the_window, _mouse_move)
 
         def _mouse(w, button, action, mods):  # NOQA
             """Handle mouse button event"""
+            if not window_class.subtree_listener_mask & mouse_button_bits:
+                return
             if action == self.glfw.PRESS:
                 event_type = "mouse_press"
             elif action == self.glfw.RELEASE:
@@ -256,10 +349,15 @@ class GLFW(UIFramework):
                 self.glfw.MOUSE_BUTTON_RIGHT: "right",
                 self.glfw.MOUSE_BUTTON_MIDDLE: "middle",
             }
-            window_class.trigger(
-                Event(
+            x, y = self.glfw.get_cursor_pos(w)  # Routes the event to the widget under it
+            window_class.handle_event(
+                MouseEvent(
                     window_class,
                     event_type,
+                    x=x,
+                    y=y,
+                    canvas_x=x,
+                    canvas_y=y,
                     button=button_map.get(button, None),
                     mods=self._mods_name(mods),
                 )
@@ -291,11 +389,19 @@ class GLFW(UIFramework):
 
         return join.join(keys)
 
-    def swap_interval(
-        self,
-        is_vsync: bool,
-    ):
-        self.glfw.swap_interval()
+    def swap_interval(self, is_vsync: bool) -> None:
+        self.glfw.swap_interval(1 if is_vsync else 0)
+
+    def wait_events(self, timeout: float | None = None) -> None:
+        if timeout is None:
+            self.glfw.wait_events()
+        elif timeout <= 0:
+            self.glfw.poll_events()
+        else:
+            self.glfw.wait_events_timeout(timeout)
+
+    def post_empty_event(self) -> None:
+        self.glfw.post_empty_event()
 
     def destroy(self, the_window) -> None:
         """Destroy glfw window"""
@@ -326,10 +432,206 @@ class GLFW(UIFramework):
     def swap_buffers(self, the_window) -> None:
         self.glfw.swap_buffers(the_window)
 
+    def get_framebuffer_size(self, the_window) -> tuple[int, int]:
+        return self.glfw.get_framebuffer_size(the_window)
+
     def can_be_closed(self, the_window) -> bool:
         return self.glfw.window_should_close(the_window)
 
+    def set_should_close(self, the_window, value: bool) -> None:
+        self.glfw.set_window_should_close(the_window, value)
+
+
+class HeadlessWindow:
+    """A window of the HEADLESS framework, which only exists in memory.
+
+    Args:
+        size: Size of the window.
+        title: Title of the window.
+    """
+
+    def __init__(self, size: tuple[int, int], title: str):
+        self.size: tuple[int, int] = size
+        self.pos: tuple[int, int] = (0, 0)
+        self.title: str = title
+        self.mouse_pos: tuple[float, float] = (0.0, 0.0)
+        self.should_close: bool = False
+        self.is_destroyed: bool = False
+        self.window_class = None  # The WindowBase receiving the events of the window
+        self.frame_count: int = 0  # Number of buffer swaps
+
+
+class HEADLESS(UIFramework):
+    """UI framework without a display server, for tests, CI and benchmarks.
+
+    Windows are `HeadlessWindow` objects drawn into in-memory surfaces (see the RASTER
+    backend). Instead of coming from a display server, input events are synthesized with
+    `send_event()` or the helpers like `mouse_move()` and `click()`. As with GLFW, the state
+    of the window changes right away, while the events are queued and dispatched by
+    `wait_events()` in the thread running the loop. Events can be sent from any thread.
+
+    Example
+    -------
+    .. code-block:: python
+
+        # CHARMY_UI_BACKEND=HEADLESS
+        window = cm.Window(size=(300, 160))
+        ui = window.frameworks.ui
+        ui.click(window.the_window, 20, 20)
+        cm.manager.update()  # Dispatch the events and draw
+        image = window.snapshot()
+    """
+
+    def __init__(self):
+        self.windows: list[HeadlessWindow] = []
+        self._queue: collections.deque[tuple[HeadlessWindow, str, dict]] = collections.deque()
+        self._condition = threading.Condition()
+        self._is_woken: bool = False
+
+    def init(self, **kwargs) -> None:
+        pass
+
+    def create(self, size, title, **kwargs) -> dict[str, typing.Any]:
+        if isinstance(size, tuple):
+            window = HeadlessWindow((size[0], size[1]), title)
+        else:
+            window = HeadlessWindow((size.width, size.height), title)
+        self.windows.append(window)
+        return {"pos": window.pos, "window": window}
+
+    def create_event_bounds(self, the_window, window_class, **kwargs) -> None:
+        the_window.window_class = window_class
+
+    # region Synthetic events
+
+    def send_event(self, the_window: HeadlessWindow, event_type: str, **kwargs) -> None:
+        """Queue an event, dispatched by the next `wait_events()`.
+
+        Args:
+            the_window: The window receiving the event.
+            event_type: Type of the event, e.g. ``"mouse_press"``.
+            **kwargs: Items of the event.
+        """
+        with self._condition:
+            self._queue.append((the_window, event_type, kwargs))
+            self._condition.notify_all()
+
+    def mouse_move(self, the_window: HeadlessWindow, x: float, y: float) -> None:
+        """Move the mouse over the window."""
+        the_window.mouse_pos = (x, y)
+        self.send_event(the_window, "mouse_move", x=x, canvas_x=x, y=y, canvas_y=y)
+
+    def mouse_press(self, the_window: HeadlessWindow, button: str = "left", mods: str = ""):
+        """Press a mouse button."""
+        x, y = the_window.mouse_pos
+        self.send_event(
+            the_window, "mouse_press", x=x, y=y, canvas_x=x, canvas_y=y, button=button, mods=mods
+        )
+
+    def mouse_release(self, the_window: HeadlessWindow, button: str = "left", mods: str = ""):
+        """Release a mouse button."""
+        x, y = the_window.mouse_pos
+        self.send_event(
+            the_window, "mouse_release", x=x, y=y, canvas_x=x, canvas_y=y, button=button, mods=mods
+        )
+
+    def click(
+        self, the_window: HeadlessWindow, x: float, y: float, button: str = "left", mods: str = ""
+    ) -> None:
+        """Move the mouse to a point, then press and release a button."""
+        self.mouse_move(the_window, x, y)
+        self.mouse_press(the_window, button, mods)
+        self.mouse_release(the_window, button, mods)
+
+    def mouse_enter(self, the_window: HeadlessWindow) -> None:
+        """Move the mouse into the window."""
+        self.send_event(the_window, "mouse_enter", the_window=the_window)
+
+    def mouse_leave(self, the_window: HeadlessWindow) -> None:
+        """Move the mouse out of the window."""
+        self.send_event(the_window, "mouse_leave", the_window=the_window)
+
+    def close(self, the_window: HeadlessWindow) -> None:
+        """Ask the window to close, like clicking its close button."""
+        the_window.should_close = True
+        self.post_empty_event()
+
+    # endregion
+
+    def swap_interval(self, is_vsync: bool) -> None:
+        pass
+
+    def wait_events(self, timeout: float | None = None) -> None:
+        with self._condition:
+            if not self._queue and not self._is_woken:
+                if timeout is None:
+                    self._condition.wait_for(lambda: self._queue or self._is_woken)
+                elif timeout > 0:
+                    self._condition.wait_for(lambda: self._queue or self._is_woken, timeout)
+            self._is_woken = False
+            events = list(self._queue)
+            self._queue.clear()
+
+        # Handlers run outside the lock, so they can send events themselves
+        for the_window, event_type, kwargs in events:
+            window_class = the_window.window_class
+            if (
+                window_class is not None
+                and not the_window.is_destroyed
+                and window_class.subtree_listener_mask & trigger_mask(event_type)
+            ):
+                window_class.handle_event(make_event(window_class, event_type, **kwargs))
+
+    def post_empty_event(self) -> None:
+        with self._condition:
+            self._is_woken = True
+            self._condition.notify_all()
+
+    def destroy(self, the_window) -> None:
+        the_window.is_destroyed = True
+        the_window.window_class = None
+        if the_window in self.windows:
+            self.windows.remove(the_window)
+
+    def set_size(self, the_window, size: Size | tuple[int, int]) -> None:
+        if isinstance(size, tuple):
+            the_window.size = (size[0], size[1])
+        else:
+            the_window.size = (size.width, size.height)
+        self.send_event(
+            the_window, "resize", width=the_window.size[0], height=the_window.size[1]
+        )
+
+    def set_pos(self, the_window, pos: Pos | tuple[int, int]) -> None:
+        if isinstance(pos, tuple):
+            the_window.pos = (pos[0], pos[1])
+        else:
+            the_window.pos = (pos.x, pos.y)
+        self.send_event(the_window, "move", x_root=the_window.pos[0], y_root=the_window.pos[1])
+
+    def set_title(self, the_window, title: str) -> None:
+        the_window.title = title
+
+    def get_mouse_pos(self, the_window) -> tuple[float, float]:
+        return the_window.mouse_pos
+
+    def make_context_current(self, the_window, **kwargs) -> None:
+        pass
+
+    def swap_buffers(self, the_window) -> None:
+        the_window.frame_count += 1
+
+    def get_framebuffer_size(self, the_window) -> tuple[int, int]:
+        return the_window.size
+
+    def can_be_closed(self, the_window) -> bool:
+        return the_window.should_close
+
+    def set_should_close(self, the_window, value: bool) -> None:
+        the_window.should_close = value
+
 
 if importlib.util.find_spec("glfw") is not None:
     window_framework_map["GLFW"] = GLFW  # NOQA
+window_framework_map["HEADLESS"] = HEADLESS  # NOQA
 # endregion
@@ -2,6 +2,10 @@
 Basic object class.
 """
 
+import gc
+import inspect
+import itertools
+import sys
 import typing
 import weakref
 
@@ -10,20 +14,147 @@ from .const import ID
 
 class InstanceCounterMeta(type):
     """
-    InstanceCounterMeta
+    InstanceCounterMeta gives each class its own counter of automatic IDs.
     """
 
     def __init__(cls, name, bases, attrs):
         super().__init__(name, bases, attrs)
-        cls._instances = weakref.WeakSet()
+        cls._id_counter = itertools.count()
 
-    def __call__(cls, *args, **kwargs):
-        instance = super().__call__(*args, **kwargs)
 
-        if type(instance) is cls:
-            cls._instances.add(instance)
+class AttributeStore(dict):
+    """AttributeStore holds the attributes shared by all CharmyObjects, see `CharmyObject.cset()`.
 
-        return instance
+    It is a dict keyed by dotted names such as ``"ui.framework.name"``. The names in `FIELDS`
+    are typed: their values are checked when set, and can also be read as plain attributes,
+    e.g. ``attributes.ui_framework``, which costs no string lookup in code running every frame.
+    Code holding on to a value can subscribe to its changes.
+
+    Example
+    -------
+    .. code-block:: python
+
+        attributes = CharmyObject.attributes
+        ui = attributes.ui_framework  # The same as attributes["ui.framework"]
+        attributes.subscribe("ui.is_vsync", lambda value: print("vsync:", value))
+        window.cset("ui.is_vsync", False)  # Prints "vsync: False"
+    """
+
+    # {name: (attribute name, type)}
+    FIELDS: typing.Dict[str, typing.Tuple[str, type]] = {
+        "frameworks": ("frameworks", object),
+        "ui.framework": ("ui_framework", object),
+        "ui.framework.name": ("ui_framework_name", str),
+        "ui.is_vsync": ("ui_is_vsync", bool),
+        "ui.samples": ("ui_samples", int),
+        "ui.windows": ("ui_windows", list),
+        "drawing.framework": ("drawing_framework", object),
+        "drawing.framework.name": ("drawing_framework_name", str),
+        "backend.framework": ("backend_framework", object),
+        "backend.framework.name": ("backend_framework_name", str),
+    }
+
+    # The attributes of `FIELDS`, None until set
+    frameworks: typing.Any = None  # charmy.frameworks.Frameworks
+    ui_framework: typing.Any = None  # charmy.frameworks.ui.UIFramework
+    ui_framework_name: str | None = None
+    ui_is_vsync: bool | None = None
+    ui_samples: int | None = None
+    ui_windows: list | None = None
+    drawing_framework: typing.Any = None  # charmy.frameworks.drawing.DrawingFramework
+    drawing_framework_name: str | None = None
+    backend_framework: typing.Any = None  # charmy.frameworks.backend.BackendFramework
+    backend_framework_name: str | None = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.subscribers: typing.Dict[str, typing.List[typing.Callable]] = {}
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, name: str, value: typing.Any) -> None:
+        field = self.FIELDS.get(name)
+        if field is not None:
+            attribute, type_ = field
+            if value is not None and not isinstance(value, type_):
+                raise TypeError(
+                    f"Shared attribute {name!r} must be {type_.__name__}, not "
+                    f"{type(value).__name__}"
+                )
+            self.__dict__[attribute] = value
+        super().__setitem__(name, value)
+        subscribers = self.subscribers.get(name)
+        if subscribers:
+            for reference in list(subscribers):
+                callback = reference()
+                if callback is None:
+                    subscribers.remove(reference)  # Its object was freed
+                else:
+                    callback(value)
+
+    def __delitem__(self, name: str) -> None:
+        super().__delitem__(name)
+        field = self.FIELDS.get(name)
+        if field is not None:
+            self.__dict__.pop(field[0], None)
+
+    def pop(self, name: str, *default) -> typing.Any:
+        value = super().pop(name, *default)
+        field = self.FIELDS.get(name)
+        if field is not None:
+            self.__dict__.pop(field[0], None)
+        return value
+
+    def popitem(self) -> tuple[str, typing.Any]:
+        name, value = super().popitem()
+        field = self.FIELDS.get(name)
+        if field is not None:
+            self.__dict__.pop(field[0], None)
+        return name, value
+
+    def clear(self) -> None:
+        super().clear()
+        for attribute, _ in self.FIELDS.values():
+            self.__dict__.pop(attribute, None)
+
+    def setdefault(self, name: str, default: typing.Any = None) -> typing.Any:
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def update(self, *args, **kwargs) -> None:
+        for name, value in dict(*args, **kwargs).items():
+            self[name] = value
+
+    def __ior__(self, other) -> typing.Self:
+        self.update(other)
+        return self
+
+    def subscribe(self, name: str, callback: typing.Callable[[typing.Any], typing.Any]) -> None:
+        """Call a function with the new value whenever a shared attribute is set.
+
+        A bound method is held weakly, so subscribing does not keep its object alive.
+
+        Args:
+            name: Name of the shared attribute.
+            callback: Called with the new value.
+        """
+        if inspect.ismethod(callback):
+            reference = weakref.WeakMethod(callback)
+        else:
+            reference = lambda: callback  # NOQA: E731
+        self.subscribers.setdefault(name, []).append(reference)
+
+    def unsubscribe(self, name: str, callback: typing.Callable[[typing.Any], typing.Any]) -> bool:
+        """Stop calling a function subscribed with `subscribe()`.
+
+        Returns:
+            bool: Whether it was subscribed.
+        """
+        for reference in self.subscribers.get(name, ()):
+            if reference() == callback:
+                self.subscribers[name].remove(reference)
+                return True
+        return False
 
 
 class CharmyObject(metaclass=InstanceCounterMeta):
@@ -37,17 +168,25 @@ class CharmyObject(metaclass=InstanceCounterMeta):
         id: ID for the object
     """
 
-    objects: typing.Dict[str, typing.Any] = {}  # find by ID {1: OBJ1, 2: OBJ2}
-    objects_sorted: typing.Dict[str, typing.Any] = (
+    # The registries only hold weak references: an object leaves them once it is freed
+    objects: weakref.WeakValueDictionary[str, typing.Any] = (
+        weakref.WeakValueDictionary()
+    )  # find by ID {1: OBJ1, 2: OBJ2}
+    objects_sorted: typing.Dict[str, weakref.WeakValueDictionary[str, typing.Any]] = (
         {}
     )  # find by class name {OBJ1: {1: OBJECT1, 2: OBJECT2}}
-    attributes: typing.Dict[str, typing.Any] = {}  # public attributes {key: value}
+    attributes: AttributeStore = AttributeStore()  # public attributes {key: value}
+    registered: bool = True  # Whether instances are put in `objects`, off for value-like classes
 
     def __init__(self, id_: ID | str = ID.AUTO):
         """CharmyObject is this project's basic class.
 
         CharmyObject provides abilities of cumulating ID and set attributes.
 
+        Automatic IDs are the class name followed by a counter of the class, e.g. ``Window0``,
+        and are never given twice. Unless the class sets `registered` to False, the object can
+        then be found by its ID with `get_obj()` for as long as it is alive.
+
         Args:
             id_ (ID | str): Optional, ID for the object
 
@@ -59,17 +198,17 @@ class CharmyObject(metaclass=InstanceCounterMeta):
         self._custom: typing.Dict[str, typing.Any] = {}  # Private custom attributes
 
         if id_ == ID.AUTO:
-            _prefix = self.class_name
-            id_ = _prefix + str(self.instance_count)
-        if id_ in self.objects:
+            id_ = self.class_name + str(next(self._id_counter))
+            while id_ in self.objects:  # Taken by an object given this ID explicitly
+                id_ = self.class_name + str(next(self._id_counter))
+        elif id_ in self.objects:
             raise KeyError(id_)
         if id_ != ID.NONE:
-            self.objects[id_] = self
             self.id: typing.Final[str] = id_  # Do not change after initialization
-
-            if self.class_name not in self.objects_sorted:
-                self.objects_sorted[self.class_name] = {self.id: self}
-            else:
+            if self.registered:
+                self.objects[id_] = self
+                if self.class_name not in self.objects_sorted:
+                    self.objects_sorted[self.class_name] = weakref.WeakValueDictionary()
                 self.objects_sorted[self.class_name][self.id] = self
 
     # region: Properties
@@ -81,13 +220,13 @@ class CharmyObject(metaclass=InstanceCounterMeta):
 
     @property
     def instances(self):
-        """Returns all the class instances."""
-        return self.__class__.objects_sorted[self.class_name]
+        """Returns all the living registered class instances."""
+        return self.__class__.objects_sorted.get(self.class_name, {})
 
     @property
     def instance_count(self):
-        """Returns the class instance count."""
-        return len(self._instances)
+        """Returns the count of the living registered class instances."""
+        return len(self.instances)
 
     # endregion
 
@@ -104,6 +243,98 @@ class CharmyObject(metaclass=InstanceCounterMeta):
 
     # endregion
 
+    # region: Diagnostics
+
+    _diagnostics_snapshot: typing.Dict[str, int] = {}  # Instance counts at the last snapshot
+
+    @staticmethod
+    def approximate_size(obj: typing.Any) -> int:
+        """Return the size in bytes of an object, its ``__dict__`` and the values in it.
+
+        Objects referred to by the values are not counted, so this is a lower bound of the
+        memory the object keeps alive.
+        """
+        size = sys.getsizeof(obj)
+        attributes = getattr(obj, "__dict__", None)
+        if attributes is not None:
+            size += sys.getsizeof(attributes)
+            size += sum(sys.getsizeof(value) for value in attributes.values())
+        return size
+
+    @classmethod
+    def instance_counts(cls) -> typing.Dict[str, int]:
+        """Return the number of living registered instances of each class, by class name."""
+        return {
+            class_name: len(instances)
+            for class_name, instances in list(cls.objects_sorted.items())
+            if len(instances)
+        }
+
+    @classmethod
+    def diagnostics(
+        cls, oldest: int = 3, snapshot: bool = True, collect: bool = True
+    ) -> typing.List[dict]:
+        """Describe the living registered instances of each class, to find what accumulates.
+
+        Example
+        -------
+        .. code-block:: python
+
+            cm.CharmyObject.diagnostics()  # Take a first snapshot
+            ...  # Open and close some panels
+            for row in cm.CharmyObject.diagnostics():
+                if row["growth"] > 0:
+                    print(row["class_name"], row["growth"], row["oldest"])
+
+        Classes with `registered` set to False are not listed.
+
+        Args:
+            oldest: How many of the oldest surviving instances to name for each class.
+            snapshot: Whether to remember the counts, which the next call compares with.
+            collect: Whether to run the garbage collector first, so that only objects still in
+                use are counted, not unreachable cycles waiting to be collected.
+
+        Returns:
+            list[dict]: One dict per class, largest first, with the items ``class_name``,
+            ``count``, ``growth`` (since the last snapshot), ``size`` (bytes, see
+            `approximate_size()`) and ``oldest`` (IDs, oldest first).
+        """
+        if collect:
+            gc.collect()
+        rows = []
+        for class_name, instances in list(cls.objects_sorted.items()):
+            objects = list(instances.values())  # Registration order
+            if not objects and class_name not in cls._diagnostics_snapshot:
+                continue
+            rows.append(
+                {
+                    "class_name": class_name,
+                    "count": len(objects),
+                    "growth": len(objects) - cls._diagnostics_snapshot.get(class_name, 0),
+                    "size": sum(cls.approximate_size(obj) for obj in objects),
+                    "oldest": [obj.id for obj in objects[:oldest]],
+                }
+            )
+        if snapshot:
+            CharmyObject._diagnostics_snapshot = {row["class_name"]: row["count"] for row in rows}
+        rows.sort(key=lambda row: row["size"], reverse=True)
+        return rows
+
+    @classmethod
+    def diagnostics_report(
+        cls, oldest: int = 3, snapshot: bool = True, collect: bool = True
+    ) -> str:
+        """Return `diagnostics()` as a table."""
+        lines = ["charmy objects:   count |   growth |  size [KiB] | class (oldest instances)"]
+        for row in cls.diagnostics(oldest, snapshot, collect):
+            lines.append(
+                f"charmy objects: {row['count']:7d} | {row['growth']:+8d} | "
+                f"{row['size'] / 1024:11.1f} | {row['class_name']} ({', '.join(row['oldest'])})"
+            )
+        return "\n".join(lines)
+
+    # endregion
+
     # region: Shared attributes set / get
 
     def cset(self, name: str, value: typing.Any):
@@ -126,9 +357,7 @@ class CharmyObject(metaclass=InstanceCounterMeta):
             Value of the attribute
 
         """
-        if name in self.attributes:
-            return self.attributes[name]
-        return default
+        return self.attributes.get(name, default)
 
     def cconfig(self, **kwargs):
         """Batch set values of multiple shared attributes in CharmyObject by giving params.
@@ -1,20 +1,20 @@
-from .object import CharmyObject
+import typing
 
 
-class Pos(CharmyObject):
-    """Pos is a class to store position."""
+class Pos(typing.NamedTuple):
+    """Pos is an immutable value storing a position.
 
-    def __init__(self, x=0, y=0):
-        super().__init__()
-        self.x: int | float = x
-        self.y: int | float = y
+    Like `Rect`, it is a named tuple rather than a `CharmyObject`, so it is cheap to create and
+    is not registered.
 
-    def __call__(self, x: int | float | None = None, y: int | float | None = None):
-        if x:
-            self.set("x", x)
-        if y:
-            self.set("y", y)
+    Example
+    -------
+    .. code-block:: python
 
-    def __str__(self):
-        """Return position in string."""
-        return f"Pos({self.get('x')}, {self.get('y')})"
+        pos = Pos(10, 20)
+        x, y = pos
+        pos = pos._replace(x=30)  # Pos(x=30, y=20)
+    """
+
+    x: int | float = 0
+    y: int | float = 0
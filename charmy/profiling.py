@@ -0,0 +1,310 @@
+"""
+Per-frame and startup timing instrumentation.
+"""
+
+import array
+import contextlib
+import csv
+import json
+import math
+import pathlib
+import time
+import typing
+
+PHASES: tuple[str, ...] = ("poll", "dispatch", "layout", "draw", "flush", "swap")
+PHASE_INDEX: dict[str, int] = {phase: index for index, phase in enumerate(PHASES)}
+
+
+class FrameTimings:
+    """FrameTimings keeps how long each phase of the last frames of a window took.
+
+    Phases are, in order:
+
+    - ``poll``: waiting for and polling input events, including time spent idle,
+    - ``dispatch``: running the handlers of input events,
+    - ``layout``: ``draw_config()`` of the widgets drawn,
+    - ``draw``: drawing the elements,
+    - ``flush``: submitting the drawing commands to the GPU,
+    - ``swap``: swapping the window buffers.
+
+    Rows are stored in a fixed-size ring buffer backed by an `array.array`, and the current frame
+    in a preallocated one, so recording a frame builds no new containers and old frames are
+    overwritten. ``busy`` is the sum of every phase but
+    ``poll``, ``total`` the sum of all of them.
+
+    Example
+    -------
+    .. code-block:: python
+
+        window.frame_timings.percentiles("busy")  # {"p50": 0.0021, "p95": 0.0049, ...}
+        window.frame_timings.worst(3)
+        window.frame_timings.export_csv("frames.csv")
+
+    Args:
+        capacity: Number of frames kept.
+    """
+
+    _WIDTH = 2 + len(PHASES)  # frame number, start time, phases...
+
+    def __init__(self, capacity: int = 600):
+        self.capacity: int = capacity
+        self.count: int = 0  # Number of frames recorded since creation
+        self._data = array.array("d", bytes(8 * capacity * self._WIDTH))
+        self._start: float = 0.0
+        self.is_open: bool = False  # Whether a frame was begun and not ended yet
+        self._current = array.array("d", bytes(8 * len(PHASES)))  # Phases of the current frame
+        self._zeros = array.array("d", bytes(8 * len(PHASES)))
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def begin_frame(self, start: float) -> None:
+        """Start recording a frame, unless one is already open.
+
+        Loop rounds that draw nothing do not end their frame, so the time they spend is added
+        to the next frame drawn instead of being recorded as a frame of its own.
+
+        Args:
+            start: The `time.perf_counter()` the frame starts at.
+        """
+        if self.is_open:
+            return
+        self.is_open = True
+        self._start = start
+        self._current[:] = self._zeros
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Add time spent in a phase to the current frame.
+
+        Args:
+            phase: One of `PHASES`.
+            seconds: The time spent.
+        """
+        self._current[PHASE_INDEX[phase]] += seconds
+
+    def current(self, phase: str) -> float:
+        """Return the time spent in a phase of the current frame so far.
+
+        Args:
+            phase: One of `PHASES`.
+        """
+        return self._current[PHASE_INDEX[phase]]
+
+    def end_frame(self) -> None:
+        """Store the current frame in the ring buffer."""
+        offset = (self.count % self.capacity) * self._WIDTH
+        self._data[offset] = self.count
+        self._data[offset + 1] = self._start
+        self._data[offset + 2 : offset + self._WIDTH] = self._current
+        self.count += 1
+        self.is_open = False
+
+    def clear(self) -> None:
+        """Forget all recorded frames."""
+        self.count = 0
+
+    # region Query
+
+    def _row(self, slot: int) -> dict[str, float]:
+        """Return the frame stored in a slot of the ring buffer as a dict."""
+        offset = slot * self._WIDTH
+        row = {"frame": int(self._data[offset]), "start": self._data[offset + 1]}
+        busy = 0.0
+        for index, phase in enumerate(PHASES):
+            row[phase] = self._data[offset + 2 + index]
+            if phase != "poll":
+                busy += row[phase]
+        row["busy"] = busy
+        row["total"] = busy + row["poll"]
+        return row
+
+    def frames(self) -> list[dict[str, float]]:
+        """Return the recorded frames, oldest first.
+
+        Returns:
+            list[dict[str, float]]: One dict per frame, with ``frame``, ``start``, every phase,
+            ``busy`` and ``total``, in seconds.
+        """
+        first = max(0, self.count - self.capacity)
+        return [self._row(frame % self.capacity) for frame in range(first, self.count)]
+
+    def values(self, phase: str = "busy") -> list[float]:
+        """Return the time spent in a phase by each recorded frame, oldest first.
+
+        Args:
+            phase: One of `PHASES`, ``busy`` or ``total``.
+        """
+        if phase in PHASE_INDEX:
+            column = 2 + PHASE_INDEX[phase]
+            first = max(0, self.count - self.capacity)
+            return [
+                self._data[(frame % self.capacity) * self._WIDTH + column]
+                for frame in range(first, self.count)
+            ]
+        return [row[phase] for row in self.frames()]
+
+    def percentiles(
+        self, phase: str = "busy", percentiles: typing.Iterable[int | float] = (50, 95, 99)
+    ) -> dict[str, float]:
+        """Return percentiles of the time spent in a phase, by nearest rank.
+
+        Args:
+            phase: One of `PHASES`, ``busy`` or ``total``.
+            percentiles: The percentiles to compute.
+
+        Returns:
+            dict[str, float]: e.g. ``{"p50": 0.002, "p95": 0.004, "p99": 0.011}``, in seconds,
+            empty if no frame was recorded.
+        """
+        values = sorted(self.values(phase))
+        if not values:
+            return {}
+        return {
+            f"p{p:g}": values[min(len(values) - 1, max(0, math.ceil(p / 100 * len(values)) - 1))]
+            for p in percentiles
+        }
+
+    def worst(self, count: int = 5, phase: str = "busy") -> list[dict[str, float]]:
+        """Return the slowest recorded frames, slowest first.
+
+        Args:
+            count: Number of frames to return.
+            phase: The phase to rank frames by, one of `PHASES`, ``busy`` or ``total``.
+        """
+        return sorted(self.frames(), key=lambda row: row[phase], reverse=True)[:count]
+
+    # endregion
+
+    # region Export
+
+    def export_csv(self, file: str | pathlib.Path | typing.TextIO) -> None:
+        """Write the recorded frames as CSV, one row per frame, times in seconds.
+
+        Args:
+            file: A path, or a text file opened with ``newline=""``.
+        """
+        if isinstance(file, (str, pathlib.Path)):
+            with open(file, "w", newline="", encoding="utf-8") as f:
+                self.export_csv(f)
+            return
+        writer = csv.DictWriter(file, fieldnames=["frame", "start", *PHASES, "busy", "total"])
+        writer.writeheader()
+        writer.writerows(self.frames())
+
+    def chrome_trace_events(self, tid: str | int = 0, pid: str | int = 0) -> list[dict]:
+        """Return the recorded frames as Chrome trace events.
+
+        Phases of a frame are laid out one after another from the start of the frame, which is
+        approximate for ``dispatch``, as handlers actually run while events are polled.
+
+        Args:
+            tid: Thread ID of the events, e.g. the window ID.
+            pid: Process ID of the events.
+        """
+        events = []
+        for row in self.frames():
+            timestamp = row["start"] * 1e6
+            for phase in PHASES:
+                duration = row[phase] * 1e6
+                if duration > 0:
+                    events.append(
+                        {
+                            "name": phase,
+                            "cat": "frame",
+                            "ph": "X",
+                            "ts": timestamp,
+                            "dur": duration,
+                            "pid": pid,
+                            "tid": tid,
+                            "args": {"frame": row["frame"]},
+                        }
+                    )
+                timestamp += duration
+        return events
+
+    def export_chrome_trace(
+        self, file: str | pathlib.Path | typing.TextIO, tid: str | int = 0
+    ) -> None:
+        """Write the recorded frames as Chrome trace-event JSON (chrome://tracing, Perfetto).
+
+        Args:
+            file: A path, or a text file.
+            tid: Thread ID of the events, e.g. the window ID.
+        """
+        export_chrome_trace({tid: self}, file)
+
+    # endregion
+
+
+def export_chrome_trace(
+    timings: dict[str | int, FrameTimings], file: str | pathlib.Path | typing.TextIO
+) -> None:
+    """Write the frames of several windows into one Chrome trace-event JSON file.
+
+    Args:
+        timings: Frame timings by thread ID, e.g. ``{window.id: window.frame_timings}``.
+        file: A path, or a text file.
+    """
+    if isinstance(file, (str, pathlib.Path)):
+        with open(file, "w", encoding="utf-8") as f:
+            export_chrome_trace(timings, f)
+        return
+    events = []
+    for tid, frame_timings in timings.items():
+        events.extend(frame_timings.chrome_trace_events(tid=tid))
+    json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+
+class StartupTimings:
+    """StartupTimings records how long the startup phases of charmy took.
+
+    Phases may nest, like imports do. Each record keeps the time spent in the phase itself and
+    its cumulative time including nested phases, so `report()` reads like the output of
+    ``python -X importtime``, but for charmy's own phases: importing the package, loading each
+    framework, creating the manager...
+
+    Example
+    -------
+    .. code-block:: python
+
+        with startup_timings.phase("load themes"):
+            load_themes()
+        print(startup_timings.report())
+
+    Or from the command line: ``python -m charmy importtime``.
+    """
+
+    def __init__(self):
+        self.records: list[tuple[str, int, float, float]] = []  # (phase, depth, self, cumulative)
+        self._children: list[float] = []  # Time spent in nested phases, per open phase
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> typing.Iterator[None]:
+        """Record the time spent in the ``with`` block as a phase.
+
+        Args:
+            name: Name of the phase.
+        """
+        self._children.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            cumulative = time.perf_counter() - start
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += cumulative
+            self.records.append((name, len(self._children), cumulative - children, cumulative))
+
+    def report(self) -> str:
+        """Return the recorded phases as a table, nested phases first, times in microseconds."""
+        lines = ["charmy startup: self [us] | cumulative | phase"]
+        for name, depth, self_time, cumulative in self.records:
+            lines.append(
+                f"charmy startup: {self_time * 1e6:9.0f} | {cumulative * 1e6:10.0f} | "
+                f"{'  ' * depth}{name}"
+            )
+        return "\n".join(lines)
+
+
+startup_timings = StartupTimings()  # Startup phases of this process
@@ -1,76 +1,514 @@
+import importlib
 import typing
 
-from .object import CharmyObject
+from .pos import Pos
+from .size import Size
 
 
-class Rect(CharmyObject):
-    """Rect is a class to store the position and size of a rectangle.
+class Rect(typing.NamedTuple):
+    """Rect is an immutable value storing the position and size of a rectangle.
+
+    Being a named tuple, a rect is a plain slotted tuple: it is not a `CharmyObject`, so
+    creating one neither builds an ID nor registers it, and it is freed as soon as it is no
+    longer used. Rects are hashable and compare by value. Methods such as `offset()` return a
+    new rect instead of changing this one.
+
+    Example
+    -------
+    .. code-block:: python
+
+        rect = Rect(10, 10, 100, 50)
+        rect.right, rect.contains(50, 20)  # 110, True
+        rect.offset(5, 0).inflate(2)  # Rect(x=13, y=8, width=104, height=54)
+        x, y, width, height = rect
 
     Attributes:
-        pos (Pos): the position of the rectangle.
-        size (Size): the size of the rectangle.
+        x (int | float): The x position of the rectangle.
+        y (int | float): The y position of the rectangle.
+        width (int | float): The width of the rectangle.
+        height (int | float): The height of the rectangle.
     """
 
-    def __init__(self):
-        super().__init__()
-        # 默认是XYWH坐标系
-        self.pos = (0, 0)
-        self.size = (0, 0)
-
-    def make_XYWH(self, 
-                  x: int | float = 0, 
-                  y: int | float = 0, 
-                  w: int | float = 0, 
-                  h: int | float = 0) -> typing.Self:
-        self.pos = (x, y)
-        self.size = (w, h)
-        return self
-
-    def make_LTRB(self, 
-                  left: int | float = 0, 
-                  top: int | float = 0, 
-                  right: int | float = 0, 
-                  bottom: int | float = 0) -> typing.Self:
-        self.pos = (left, top)
-        self.size = (right - left, bottom - top)
-        return self
-
-    def __str__(self):
-        """Return position in string."""
-        return f"Rect({self.pos[0]}, {self.pos[1]}, {self.size[0]}, {self.size[1]})"
+    x: int | float = 0
+    y: int | float = 0
+    width: int | float = 0
+    height: int | float = 0
+
+    @classmethod
+    def make_XYWH(
+        cls, x: int | float = 0, y: int | float = 0, w: int | float = 0, h: int | float = 0
+    ) -> "Rect":
+        """Create a rect from its position and size."""
+        return cls(x, y, w, h)
+
+    @classmethod
+    def make_LTRB(
+        cls,
+        left: int | float = 0,
+        top: int | float = 0,
+        right: int | float = 0,
+        bottom: int | float = 0,
+    ) -> "Rect":
+        """Create a rect from its edges."""
+        return cls(left, top, right - left, bottom - top)
 
     # region Attributes set/get
 
+    @property
+    def pos(self) -> Pos:
+        return Pos(self.x, self.y)
+
+    @property
+    def size(self) -> Size:
+        return Size(self.width, self.height)
+
     @property
     def left(self):
-        return self.pos[0]
+        return self.x
 
     @property
     def top(self):
-        return self.pos[1]
+        return self.y
 
     @property
     def right(self):
-        return self.pos[0] + self.size[0]
+        return self.x + self.width
 
     @property
     def bottom(self):
-        return self.pos[1] + self.size[1]
+        return self.y + self.height
 
     @property
-    def x(self):
-        return self.pos[0]
+    def ltrb(self) -> tuple[int | float, int | float, int | float, int | float]:
+        """Return the edges as (left, top, right, bottom)."""
+        return self.x, self.y, self.x + self.width, self.y + self.height
+
+    # endregion
+
+    # region Geometry
+
+    def is_empty(self) -> bool:
+        """Return whether the rectangle covers no area."""
+        return self.width <= 0 or self.height <= 0
+
+    def contains(self, x: int | float, y: int | float) -> bool:
+        """Return whether a point lies in the rectangle, right and bottom edges excluded.
+
+        Args:
+            x: The x position of the point.
+            y: The y position of the point.
+        """
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
+    def contains_rect(self, other: "Rect") -> bool:
+        """Return whether another rectangle lies entirely in this one.
+
+        Args:
+            other (Rect): The rectangle to test.
+        """
+        return (
+            self.x <= other.x
+            and self.y <= other.y
+            and other.x + other.width <= self.x + self.width
+            and other.y + other.height <= self.y + self.height
+        )
+
+    def intersects(self, other: "Rect") -> bool:
+        """Return whether this rectangle overlaps another one.
+
+        Args:
+            other (Rect): The rectangle to test against.
+        """
+        return (
+            self.x < other.x + other.width
+            and other.x < self.x + self.width
+            and self.y < other.y + other.height
+            and other.y < self.y + self.height
+        )
+
+    def intersect(self, other: "Rect") -> "Rect":
+        """Return the area shared by both rectangles, an empty rect if they do not overlap.
+
+        Args:
+            other (Rect): The rectangle to intersect with.
+        """
+        left = max(self.x, other.x)
+        top = max(self.y, other.y)
+        right = min(self.x + self.width, other.x + other.width)
+        bottom = min(self.y + self.height, other.y + other.height)
+        if right <= left or bottom <= top:
+            return Rect(left, top, 0, 0)
+        return Rect(left, top, right - left, bottom - top)
+
+    def union(self, other: "Rect") -> "Rect":
+        """Return the smallest rectangle containing both rectangles.
+
+        Args:
+            other (Rect): The rectangle to unite with.
+        """
+        if other.is_empty():
+            return self
+        if self.is_empty():
+            return other
+        left = min(self.x, other.x)
+        top = min(self.y, other.y)
+        return Rect(
+            left,
+            top,
+            max(self.x + self.width, other.x + other.width) - left,
+            max(self.y + self.height, other.y + other.height) - top,
+        )
+
+    def offset(self, dx: int | float, dy: int | float) -> "Rect":
+        """Return the rectangle moved by an offset.
+
+        Args:
+            dx: The offset along x.
+            dy: The offset along y.
+        """
+        return Rect(self.x + dx, self.y + dy, self.width, self.height)
+
+    def inflate(self, dx: int | float, dy: int | float | None = None) -> "Rect":
+        """Return the rectangle grown on every side, or shrunk with negative values.
+
+        Args:
+            dx: How much to grow the left and right edges.
+            dy: How much to grow the top and bottom edges. Defaults to None, as much as ``dx``.
+        """
+        if dy is None:
+            dy = dx
+        return Rect(self.x - dx, self.y - dy, self.width + 2 * dx, self.height + 2 * dy)
+
+    # endregion
+
+
+class RectArray:
+    """RectArray stores many rectangles in one NumPy array, for operations over all of them.
+
+    The rectangles are kept as a C-contiguous ``(n, 4)`` float32 array of (left, top, right,
+    bottom), the memory layout of ``SkRect``, which `ltrb` and ``numpy.asarray()`` hand out
+    without copying. Predicates return boolean arrays, and geometry methods return new arrays,
+    each in one vectorized NumPy call instead of a Python loop over `Rect` objects.
+
+    Indexing with an integer gives a `Rect`. Indexing with a slice, a boolean mask or an index
+    array gives a `RectArray`. As in NumPy, every slice, stepped ones included, is a view that
+    writes through to this array, and masks and index arrays give copies. A stepped slice is
+    not C-contiguous, pass it to ``numpy.ascontiguousarray()`` to get a packed copy.
+
+    Drawing frameworks fill them in one call with ``draw_rect_array()``, which reads `ltrb`
+    directly. Add them to a widget with
+    ``widget.add_element("rect_array", rect=rects.union_bounds(), rects=rects, color=color)``.
+
+    Example
+    -------
+    .. code-block:: python
+
+        bounds = RectArray.from_rects(child.rect for child in window.children)
+        visible = bounds.cull(Rect(0, 0, *window.size))  # Indices of the visible children
+        hit = bounds.contains(x, y).nonzero()[0]
+        area = bounds.union_bounds()
+
+    Args:
+        size: Number of rectangles, all zeroed.
+        data: An ``(n, 4)`` float32 array of (left, top, right, bottom) to use instead,
+            without copying.
+    """
+
+    def __init__(self, size: int = 0, data: typing.Any = None):
+        try:
+            self.numpy = importlib.import_module("numpy")
+        except ImportError as e:
+            raise ImportError("RectArray requires numpy, please install it first.") from e
+
+        if data is None:
+            data = self.numpy.zeros((size, 4), dtype=self.numpy.float32)
+        elif data.ndim != 2 or data.shape[1] != 4 or data.dtype != self.numpy.float32:
+            raise TypeError("RectArray data must be a float32 array of shape (n, 4)")
+        self.data = data
+
+    # region Creation
+
+    @classmethod
+    def from_ltrb(cls, left, top, right, bottom) -> "RectArray":
+        """Create an array from the edges of the rectangles, as arrays or scalars."""
+        numpy = importlib.import_module("numpy")
+        edges = numpy.broadcast_arrays(left, top, right, bottom)
+        return cls(data=numpy.stack(edges, axis=1).astype(numpy.float32, copy=False))
+
+    @classmethod
+    def from_xywh(cls, x, y, width, height) -> "RectArray":
+        """Create an array from the positions and sizes of the rectangles, as arrays or scalars."""
+        numpy = importlib.import_module("numpy")
+        x = numpy.asarray(x, dtype=numpy.float32)
+        y = numpy.asarray(y, dtype=numpy.float32)
+        return cls.from_ltrb(x, y, x + width, y + height)
+
+    @classmethod
+    def from_rects(cls, rects: typing.Iterable[Rect]) -> "RectArray":
+        """Create an array from `Rect` objects, or any (x, y, width, height) tuples."""
+        numpy = importlib.import_module("numpy")
+        xywh = numpy.array(list(rects), dtype=numpy.float32).reshape(-1, 4)
+        xywh[:, 2:] += xywh[:, :2]
+        return cls(data=xywh)
+
+    # endregion
+
+    # region Access
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index) -> "Rect | RectArray":
+        if isinstance(index, int | self.numpy.integer):
+            left, top, right, bottom = self.data[index].tolist()
+            return Rect(left, top, right - left, bottom - top)
+        return RectArray(data=self.data[index])
+
+    def __setitem__(self, index, rect: "Rect | RectArray") -> None:
+        if isinstance(rect, RectArray):
+            self.data[index] = rect.data
+        else:
+            self.data[index] = rect.ltrb
+
+    def __iter__(self) -> typing.Iterator[Rect]:
+        for left, top, right, bottom in self.data.tolist():
+            yield Rect(left, top, right - left, bottom - top)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is not None and self.numpy.dtype(dtype) != self.data.dtype:
+            if copy is False:
+                raise ValueError(f"RectArray cannot be converted to {dtype} without a copy")
+            return self.data.astype(dtype)
+        return self.data.copy() if copy else self.data
+
+    def to_rects(self) -> list[Rect]:
+        """Return the rectangles as `Rect` objects."""
+        return list(self)
 
     @property
-    def y(self):
-        return self.pos[1]
+    def ltrb(self):
+        """The ``(n, 4)`` float32 array of (left, top, right, bottom), not a copy."""
+        return self.data
+
+    @property
+    def left(self):
+        return self.data[:, 0]
+
+    @property
+    def top(self):
+        return self.data[:, 1]
+
+    @property
+    def right(self):
+        return self.data[:, 2]
+
+    @property
+    def bottom(self):
+        return self.data[:, 3]
+
+    x = left
+    y = top
 
     @property
     def width(self):
-        return self.size[0]
+        return self.data[:, 2] - self.data[:, 0]
 
     @property
     def height(self):
-        return self.size[1]
+        return self.data[:, 3] - self.data[:, 1]
+
+    # endregion
+
+    # region Predicates
+
+    def is_empty(self):
+        """Return a boolean array telling which rectangles cover no area."""
+        return (self.data[:, 2] <= self.data[:, 0]) | (self.data[:, 3] <= self.data[:, 1])
+
+    def contains(self, x: int | float, y: int | float):
+        """Return a boolean array telling which rectangles contain a point.
+
+        Args:
+            x: The x position of the point.
+            y: The y position of the point.
+        """
+        data = self.data
+        return (data[:, 0] <= x) & (x < data[:, 2]) & (data[:, 1] <= y) & (y < data[:, 3])
+
+    def contains_rect(self, rect: Rect):
+        """Return a boolean array telling which rectangles contain a rect entirely.
+
+        Args:
+            rect (Rect): The rectangle to test.
+        """
+        left, top, right, bottom = rect.ltrb
+        data = self.data
+        return (
+            (data[:, 0] <= left)
+            & (data[:, 1] <= top)
+            & (right <= data[:, 2])
+            & (bottom <= data[:, 3])
+        )
+
+    def intersects(self, rect: Rect):
+        """Return a boolean array telling which rectangles overlap a rect.
+
+        Args:
+            rect (Rect): The rectangle to test against.
+        """
+        left, top, right, bottom = rect.ltrb
+        data = self.data
+        return (
+            (data[:, 0] < right)
+            & (left < data[:, 2])
+            & (data[:, 1] < bottom)
+            & (top < data[:, 3])
+        )
+
+    def cull(self, viewport: Rect):
+        """Return the indices of the rectangles overlapping a viewport, in order.
+
+        Args:
+            viewport (Rect): The visible area.
+        """
+        return self.numpy.flatnonzero(self.intersects(viewport))
+
+    # endregion
+
+    # region Geometry
+
+    def intersect(self, rect: Rect) -> "RectArray":
+        """Return each rectangle clipped to a rect, empty where they do not overlap.
+
+        Args:
+            rect (Rect): The rectangle to clip to.
+        """
+        numpy = self.numpy
+        data = numpy.empty_like(self.data)
+        numpy.maximum(self.data[:, :2], rect.ltrb[:2], out=data[:, :2])
+        numpy.minimum(self.data[:, 2:], rect.ltrb[2:], out=data[:, 2:])
+        numpy.maximum(data[:, 2:], data[:, :2], out=data[:, 2:])  # No negative size
+        return RectArray(data=data)
+
+    def union_bounds(self) -> Rect:
+        """Return the smallest rect containing all the non-empty rectangles."""
+        data = self.data[~self.is_empty()]
+        if not len(data):
+            return Rect()
+        left, top = data[:, :2].min(axis=0).tolist()
+        right, bottom = data[:, 2:].max(axis=0).tolist()
+        return Rect.make_LTRB(left, top, right, bottom)
+
+    def offset(self, dx, dy) -> "RectArray":
+        """Return the rectangles moved by an offset, scalars or one per rectangle."""
+        offset = self.numpy.stack(self.numpy.broadcast_arrays(dx, dy, dx, dy), axis=-1)
+        return RectArray(data=(self.data + offset).astype(self.numpy.float32, copy=False))
+
+    def inflate(self, dx, dy=None) -> "RectArray":
+        """Return the rectangles grown on every side, scalars or one per rectangle.
+
+        Args:
+            dx: How much to grow the left and right edges.
+            dy: How much to grow the top and bottom edges. Defaults to None, as much as ``dx``.
+        """
+        if dy is None:
+            dy = dx
+        grow = self.numpy.stack(self.numpy.broadcast_arrays(-dx, -dy, dx, dy), axis=-1)
+        return RectArray(data=(self.data + grow).astype(self.numpy.float32, copy=False))
+
+    def argsort(self, key: str | typing.Any = "top"):
+        """Return the indices sorting the rectangles, keeping the order of equal ones.
+
+        Args:
+            key: ``"left"``, ``"top"``, ``"right"``, ``"bottom"``, ``"width"`` or
+                ``"height"``, or an array with a value per rectangle, such as z-indices.
+        """
+        values = getattr(self, key) if isinstance(key, str) else self.numpy.asarray(key)
+        return self.numpy.argsort(values, kind="stable")
+
+    def sorted(self, key: str | typing.Any = "top") -> "RectArray":
+        """Return the rectangles sorted by a key, see `argsort()`."""
+        return RectArray(data=self.data[self.argsort(key)])
 
     # endregion
+
+
+class DamageRegion:
+    """DamageRegion collects the areas of a window that have to be redrawn.
+
+    Invalidated rectangles are merged with the ones they overlap, so the region stays a short
+    list of disjoint boxes. Once it holds more than `max_rects` boxes it collapses into their
+    bounding box, which keeps clipping and intersection tests cheap.
+
+    Args:
+        max_rects: Maximum number of boxes kept before collapsing into one.
+    """
+
+    def __init__(self, max_rects: int = 8):
+        self.max_rects: int = max_rects
+        self.rects: list[tuple[float, float, float, float]] = []  # [(left, top, right, bottom)]
+        self.is_full: bool = False  # Whether the whole window is damaged
+
+    def __bool__(self) -> bool:
+        return self.is_full or bool(self.rects)
+
+    def add(self, rect: Rect) -> None:
+        """Add the area of a rectangle to the region.
+
+        Args:
+            rect (Rect): The invalidated rectangle.
+        """
+        self.add_ltrb(rect.left, rect.top, rect.right, rect.bottom)
+
+    def add_ltrb(
+        self, left: int | float, top: int | float, right: int | float, bottom: int | float
+    ) -> None:
+        """Add an area given by its edges to the region."""
+        if self.is_full or right <= left or bottom <= top:
+            return
+        merged = True
+        while merged:
+            merged = False
+            for index, (l, t, r, b) in enumerate(self.rects):
+                if left <= r and l <= right and top <= b and t <= bottom:
+                    left, top = min(left, l), min(top, t)
+                    right, bottom = max(right, r), max(bottom, b)
+                    self.rects.pop(index)
+                    merged = True
+                    break
+        self.rects.append((left, top, right, bottom))
+        if len(self.rects) > self.max_rects:
+            self.rects = [self.bounds_ltrb()]
+
+    def add_full(self) -> None:
+        """Mark the whole window as damaged."""
+        self.is_full = True
+        self.rects.clear()
+
+    def clear(self) -> None:
+        """Empty the region, usually after it has been redrawn."""
+        self.is_full = False
+        self.rects.clear()
+
+    def bounds_ltrb(self) -> tuple[float, float, float, float]:
+        """Return the bounding box of the region as (left, top, right, bottom)."""
+        return (
+            min(rect[0] for rect in self.rects),
+            min(rect[1] for rect in self.rects),
+            max(rect[2] for rect in self.rects),
+            max(rect[3] for rect in self.rects),
+        )
+
+    def intersects(self, rect: Rect) -> bool:
+        """Return whether a rectangle overlaps the damaged area.
+
+        Args:
+            rect (Rect): The rectangle to test.
+        """
+        if self.is_full:
+            return True
+        left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+        for l, t, r, b in self.rects:
+            if left < r and l < right and top < b and t < bottom:
+                return True
+        return False
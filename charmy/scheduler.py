@@ -0,0 +1,281 @@
+"""
+Frame pacing and timers for the manager loop.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+import typing
+
+from .const import FrameMode
+
+
+class FrameScheduler:
+    """FrameScheduler decides how long the manager loop may sleep and when to draw.
+
+    - `FrameMode.ON_DEMAND`: block until an input event or a wake-up arrives, and draw right
+      after it. Nothing runs while the application is idle.
+    - `FrameMode.FIXED_FPS`: draw when the next frame deadline is reached and sleep until then.
+      Input events arriving in between are dispatched without drawing.
+    - `FrameMode.CONTINUOUS`: never sleep, draw every loop iteration.
+
+    Example
+    -------
+    .. code-block:: python
+
+        scheduler = FrameScheduler(FrameMode.FIXED_FPS, fps=30)
+        while running:
+            ui_framework.wait_events(scheduler.timeout(has_pending_work))
+            if scheduler.is_frame_due():
+                draw_windows()
+                scheduler.frame_done()
+
+    Args:
+        mode: How to pace frames.
+        fps: Target frame rate of `FrameMode.FIXED_FPS`.
+    """
+
+    def __init__(self, mode: FrameMode = FrameMode.ON_DEMAND, fps: int | float = 60):
+        self.mode: FrameMode = mode
+        self.fps: int | float = fps
+        self.next_frame_time: float = 0.0  # Deadline of the next frame, in `time.perf_counter()`
+
+    @property
+    def frame_interval(self) -> float:
+        """Return the time between two frames of `FrameMode.FIXED_FPS`, in seconds."""
+        return 1 / self.fps
+
+    def timeout(self, has_pending_work: bool = False, now: float | None = None) -> float | None:
+        """Return how long the loop may wait for events.
+
+        Args:
+            has_pending_work: Whether something waits to be drawn or run, e.g. a dirty window.
+                It only shortens the wait in `FrameMode.ON_DEMAND`, the other modes draw at
+                their own pace.
+            now: The current `time.perf_counter()`. Defaults to None, read it.
+
+        Returns:
+            float | None: Seconds to wait, 0 to only poll, or None to block until an event.
+        """
+        match self.mode:
+            case FrameMode.ON_DEMAND:
+                return 0 if has_pending_work else None
+            case FrameMode.FIXED_FPS:
+                if now is None:
+                    now = time.perf_counter()
+                return max(0.0, self.next_frame_time - now)
+            case _:
+                return 0
+
+    def is_frame_due(self, now: float | None = None) -> bool:
+        """Return whether the windows should be drawn in this loop iteration.
+
+        Args:
+            now: The current `time.perf_counter()`. Defaults to None, read it.
+        """
+        if self.mode != FrameMode.FIXED_FPS:
+            return True
+        if now is None:
+            now = time.perf_counter()
+        return now >= self.next_frame_time
+
+    def frame_done(self, now: float | None = None) -> None:
+        """Schedule the next frame after one was drawn.
+
+        Args:
+            now: The current `time.perf_counter()`. Defaults to None, read it.
+        """
+        if self.mode != FrameMode.FIXED_FPS:
+            return
+        if now is None:
+            now = time.perf_counter()
+        self.next_frame_time += self.frame_interval
+        if self.next_frame_time <= now:
+            # Fell behind (e.g. a slow frame), restart from now instead of catching up in a burst
+            self.next_frame_time = now + self.frame_interval
+
+
+class Timer:
+    """A timer of a `TimerQueue`, returned by `TimerQueue.add()`.
+
+    Args:
+        due: The `time.perf_counter()` the timer fires at.
+        callback: Called without arguments when the timer fires.
+        interval: Seconds between two runs of a repeating timer, None to run once.
+    """
+
+    __slots__ = ("due", "callback", "interval", "is_cancelled", "is_fired")
+
+    def __init__(
+        self, due: float, callback: typing.Callable[[], typing.Any], interval: float | None = None
+    ):
+        self.due: float = due
+        self.callback: typing.Callable[[], typing.Any] = callback
+        self.interval: float | None = interval
+        self.is_cancelled: bool = False
+        self.is_fired: bool = False  # Whether a timer running once already ran
+
+
+class TimerQueue:
+    """TimerQueue keeps timers in a binary heap ordered by due time.
+
+    Adding a timer costs O(log n). Cancelling one costs O(1): it is only flagged, and dropped
+    when it reaches the top of the heap, or when cancelled timers make up more than half of the
+    heap, which is then rebuilt. The manager loop sleeps until `timeout()` and calls
+    `run_due()`, so thousands of timers need no polling thread.
+
+    Timers run in the thread calling `run_due()`, the loop thread, but may be added and
+    cancelled from any thread.
+
+    Example
+    -------
+    .. code-block:: python
+
+        timers = TimerQueue()
+        timer = timers.add(0.5, lambda: print("Half a second later"))
+        timers.add(1, refresh_rows, interval=1)  # Every second
+        timers.cancel(timer)
+
+    Args:
+        wake: Called when a timer becomes the earliest one, to wake up a loop waiting for
+            the previous earliest one.
+    """
+
+    def __init__(self, wake: typing.Callable[[], typing.Any] | None = None):
+        self.wake: typing.Callable[[], typing.Any] | None = wake
+        self.heap: list[tuple[float, int, Timer]] = []  # (due, sequence, timer)
+        self.cancelled_count: int = 0  # Cancelled timers still in `heap`
+        self._sequence = itertools.count()  # Keeps timers due at the same time in order
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.heap) - self.cancelled_count
+
+    def add(
+        self,
+        delay: float,
+        callback: typing.Callable[[], typing.Any],
+        interval: float | None = None,
+    ) -> Timer:
+        """Add a timer.
+
+        Args:
+            delay: Seconds before the timer fires.
+            callback: Called without arguments when the timer fires.
+            interval: Seconds between two runs of a repeating timer. Defaults to None, run once.
+
+        Returns:
+            Timer: The timer, to pass to `cancel()`.
+
+        Raises:
+            ValueError: If ``interval`` is not above 0.
+        """
+        if interval is not None and interval <= 0:
+            raise ValueError(f"Timer interval must be above 0 seconds, got {interval}")
+        timer = Timer(time.perf_counter() + delay, callback, interval)
+        self._push(timer)
+        return timer
+
+    def _push(self, timer: Timer) -> None:
+        """Insert a timer into the heap, waking the loop if it is the earliest one."""
+        with self._lock:
+            heapq.heappush(self.heap, (timer.due, next(self._sequence), timer))
+            is_earliest = self.heap[0][2] is timer
+        if is_earliest and self.wake is not None:
+            self.wake()
+
+    def cancel(self, timer: Timer) -> bool:
+        """Cancel a timer.
+
+        Returns:
+            bool: Whether the timer was pending.
+        """
+        with self._lock:
+            if timer.is_cancelled or timer.is_fired:
+                return False
+            timer.is_cancelled = True
+            if timer.due < 0:
+                return True  # Taken out of the heap by `run_due()`, about to run
+            timer.callback = None  # Free what it refers to, it stays in the heap for a while
+            self.cancelled_count += 1
+            if self.cancelled_count > 64 and self.cancelled_count > len(self.heap) // 2:
+                self.heap = [entry for entry in self.heap if not entry[2].is_cancelled]
+                heapq.heapify(self.heap)
+                self.cancelled_count = 0
+        return True
+
+    def next_due(self) -> float | None:
+        """Return the `time.perf_counter()` the earliest timer fires at, or None."""
+        with self._lock:
+            heap = self.heap
+            while heap and heap[0][2].is_cancelled:
+                heapq.heappop(heap)
+                self.cancelled_count -= 1
+            return heap[0][0] if heap else None
+
+    def timeout(self, now: float | None = None) -> float | None:
+        """Return the seconds until the earliest timer fires, 0 if overdue, or None if no timer.
+
+        Args:
+            now: The current `time.perf_counter()`. Defaults to None, read it.
+        """
+        due = self.next_due()
+        if due is None:
+            return None
+        if now is None:
+            now = time.perf_counter()
+        return max(0.0, due - now)
+
+    def run_due(self, now: float | None = None) -> int:
+        """Run the timers due, rescheduling the repeating ones.
+
+        Each timer runs at most once per call: a repeating timer is rescheduled after ``now``.
+        Timers added by callbacks run at the earliest in the next call. If a callback raises,
+        the other due timers still run, then the first exception propagates.
+
+        Args:
+            now: The current `time.perf_counter()`. Defaults to None, read it.
+
+        Returns:
+            int: Number of timers run.
+        """
+        if now is None:
+            now = time.perf_counter()
+        due_timers = []
+        with self._lock:
+            heap = self.heap
+            while heap and heap[0][0] <= now:
+                _, _, timer = heapq.heappop(heap)
+                if timer.is_cancelled:
+                    self.cancelled_count -= 1
+                    continue
+                due_timers.append(timer)
+            # Pushed back after popping, so a repeat never comes up twice in this call
+            for timer in due_timers:
+                if timer.interval is None:
+                    timer.due = -1.0  # No longer in the heap
+                else:
+                    timer.due += timer.interval
+                    if timer.due <= now:
+                        # Fell behind, restart from now instead of catching up in a burst
+                        timer.due = now + timer.interval
+                    heapq.heappush(heap, (timer.due, next(self._sequence), timer))
+
+        error = None
+        for timer in due_timers:
+            # Read once: `cancel()` may clear it from another thread between the check and the
+            # call
+            callback = timer.callback
+            if timer.is_cancelled or callback is None:  # Cancelled since it was popped
+                continue
+            if timer.interval is None:
+                timer.is_fired = True
+            try:
+                callback()
+            except Exception as e:
+                if error is None:
+                    error = e
+        if error is not None:
+            raise error
+        return len(due_timers)
@@ -1,29 +1,20 @@
-from .object import CharmyObject
+import typing
 
 
-class Size(CharmyObject):
-    """Size is a class to store size.
+class Size(typing.NamedTuple):
+    """Size is an immutable value storing a size.
 
-    To reset the size, use the __call__ method.
+    Like `Rect`, it is a named tuple rather than a `CharmyObject`, so it is cheap to create and
+    is not registered.
 
-    Example:
-        >>> size = Size(100, 200)
-        >>> print(size)  # CSize(100, 200)
-        >>> size(300, 400)  # or size.__call__(300, 400)
-        >>> print(size)  # CSize(300, 400)
-    ```
-    """
-
-    def __init__(self, width=0, height=0):
-        super().__init__()
-        self.width: int | float = width
-        self.height: int | float = height
+    Example
+    -------
+    .. code-block:: python
 
-    def __call__(self, width: int | float | None = None, height: int | float | None = None):
-        if width:
-            self.set("width", width)
-        if height:
-            self.set("height", height)
+        size = Size(100, 200)
+        width, height = size
+        size = size._replace(width=300)  # Size(width=300, height=200)
+    """
 
-    def __str__(self):
-        return f"Size({self.get('width')}, {self.get('height')})"
+    width: int | float = 0
+    height: int | float = 0
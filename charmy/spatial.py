@@ -0,0 +1,199 @@
+"""
+Spatial index for hit-testing and culling.
+"""
+
+import math
+import typing
+
+from .rect import Rect
+
+
+class SpatialGrid:
+    """SpatialGrid indexes items by their rectangle in a uniform grid.
+
+    Each item is stored in every cell its rectangle overlaps, so a point query only looks at the
+    items of one cell, and a rectangle query at the items of the cells it covers. Items spanning
+    more than `max_cells` cells are kept in a separate list checked by every query, so a few
+    huge items do not fill the whole grid.
+
+    Query results follow insertion order, which containers use as drawing order: the last
+    item of a point query is the topmost one.
+
+    Args:
+        cell_size: Width and height of a cell.
+        max_cells: Maximum number of cells an item is stored in.
+    """
+
+    def __init__(self, cell_size: int | float = 32, max_cells: int = 1024):
+        self.cell_size: int | float = cell_size
+        self.max_cells: int = max_cells
+        # Entries are (order, left, top, right, bottom), stored with the item in each of its
+        # cells so queries do not need a second lookup
+        self.cells: dict[tuple[int, int], dict] = {}  # {(column, row): {item: entry}}
+        self.large_items: dict = {}  # {item: entry}, items spanning more than `max_cells` cells
+        # {item: (entry, (column0, row0, column1, row1) | None)}
+        self.items: dict[typing.Any, tuple[tuple, tuple | None]] = {}
+        self._next_order: int = 0
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item) -> bool:
+        return item in self.items
+
+    def _cell_range(self, left, top, right, bottom) -> tuple[int, int, int, int]:
+        """Return the cells (column0, row0, column1, row1) covered by an area, inclusive."""
+        size = self.cell_size
+        return (
+            math.floor(left / size),
+            math.floor(top / size),
+            math.ceil(right / size) - 1,
+            math.ceil(bottom / size) - 1,
+        )
+
+    def insert(self, item, rect: Rect) -> None:
+        """Add an item, or move it if it is already indexed.
+
+        An item keeps its order when moved.
+
+        Args:
+            item: The item to index, e.g. a widget.
+            rect (Rect): The area of the item.
+        """
+        if item in self.items:
+            order = self.items[item][0][0]
+            self.remove(item)
+        else:
+            order = self._next_order
+            self._next_order += 1
+
+        left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+        entry = (order, left, top, right, bottom)
+        cell_range = None
+        if right > left and bottom > top:  # Empty items are never found
+            cell_range = self._cell_range(left, top, right, bottom)
+            column0, row0, column1, row1 = cell_range
+            if (column1 - column0 + 1) * (row1 - row0 + 1) > self.max_cells:
+                self.large_items[item] = entry
+            else:
+                cells = self.cells
+                for column in range(column0, column1 + 1):
+                    for row in range(row0, row1 + 1):
+                        if (column, row) in cells:
+                            cells[(column, row)][item] = entry
+                        else:
+                            cells[(column, row)] = {item: entry}
+        self.items[item] = (entry, cell_range)
+
+    update = insert
+
+    def remove(self, item) -> bool:
+        """Remove an item.
+
+        Returns:
+            bool: Whether the item was indexed.
+        """
+        if item not in self.items:
+            return False
+        _, cell_range = self.items.pop(item)
+        if item in self.large_items:
+            del self.large_items[item]
+        elif cell_range is not None:
+            column0, row0, column1, row1 = cell_range
+            cells = self.cells
+            for column in range(column0, column1 + 1):
+                for row in range(row0, row1 + 1):
+                    cell = cells[(column, row)]
+                    del cell[item]
+                    if not cell:
+                        del cells[(column, row)]
+        return True
+
+    def clear(self) -> None:
+        """Remove all items."""
+        self.cells.clear()
+        self.large_items.clear()
+        self.items.clear()
+
+    def in_order(self, found: typing.Iterable) -> list:
+        """Return items sorted by their insertion order."""
+        items = self.items
+        return sorted(found, key=lambda item: items[item][0][0])
+
+    def query_point(self, x: int | float, y: int | float) -> list:
+        """Return the items containing a point, in order.
+
+        Args:
+            x: The x position of the point.
+            y: The y position of the point.
+        """
+        size = self.cell_size
+        cell = self.cells.get((math.floor(x / size), math.floor(y / size)), {})
+        found = []
+        for candidates in (cell, self.large_items):
+            for item, (order, left, top, right, bottom) in candidates.items():
+                if left <= x < right and top <= y < bottom:
+                    found.append((order, item))
+        found.sort(key=lambda pair: pair[0])
+        return [item for _, item in found]
+
+    def topmost_at(self, x: int | float, y: int | float) -> typing.Any | None:
+        """Return the last-inserted item containing a point, or None.
+
+        Args:
+            x: The x position of the point.
+            y: The y position of the point.
+        """
+        size = self.cell_size
+        cell = self.cells.get((math.floor(x / size), math.floor(y / size)), {})
+        topmost = None
+        topmost_order = -1
+        for candidates in (cell, self.large_items):
+            for item, (order, left, top, right, bottom) in candidates.items():
+                if order > topmost_order and left <= x < right and top <= y < bottom:
+                    topmost, topmost_order = item, order
+        return topmost
+
+    def query_ltrb(
+        self, left: int | float, top: int | float, right: int | float, bottom: int | float
+    ) -> set:
+        """Return the items overlapping an area, unordered.
+
+        Args:
+            left: The left edge of the area.
+            top: The top edge of the area.
+            right: The right edge of the area.
+            bottom: The bottom edge of the area.
+        """
+        found = set()
+        if right <= left or bottom <= top:
+            return found
+        column0, row0, column1, row1 = self._cell_range(left, top, right, bottom)
+        if (column1 - column0 + 1) * (row1 - row0 + 1) > len(self.cells):
+            # The area covers more cells than are in use, so walk the used ones instead
+            cells = [
+                cell
+                for (column, row), cell in self.cells.items()
+                if column0 <= column <= column1 and row0 <= row <= row1
+            ]
+        else:
+            cells = [
+                self.cells[(column, row)]
+                for column in range(column0, column1 + 1)
+                for row in range(row0, row1 + 1)
+                if (column, row) in self.cells
+            ]
+        cells.append(self.large_items)
+        for cell in cells:
+            for item, (_, l, t, r, b) in cell.items():
+                if left < r and l < right and top < b and t < bottom:
+                    found.add(item)
+        return found
+
+    def query_rect(self, rect: Rect) -> list:
+        """Return the items overlapping a rectangle, in order.
+
+        Args:
+            rect (Rect): The area to query.
+        """
+        return self.in_order(self.query_ltrb(rect.left, rect.top, rect.right, rect.bottom))
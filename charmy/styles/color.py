@@ -1,25 +1,20 @@
 import typing
 
-from ..const import Drawing
 from ..object import CharmyObject
 
 
 class Color(CharmyObject):
     """Color manager"""
 
+    registered = False  # Colors are values, created in numbers and not looked up by ID
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Auto find CharmyManager Object
-        self.frameworks = self.cget("frameworks")
-
-        # Import Drawing Framework
-        match self.frameworks.drawing_name:
-            case "SKIA":
-                self.skia = self.frameworks.drawing.skia
-            case _:
-                raise ValueError(
-                    f"Not supported drawing frameworks: {self.frameworks.drawing_name}"
-                )
+        self.frameworks = self.attributes.frameworks
+
+        # Resolve the drawing framework once, so setting a color does not dispatch on its name
+        self.drawing = self.frameworks.drawing
         self.color_object = None
 
     def set_color_rgba(
@@ -36,9 +31,7 @@ class Color(CharmyObject):
         Returns:
             None
         """
-        match self.frameworks.drawing_name:
-            case "SKIA":
-                self.color_object = self.skia.Color(self._c(r), self._c(g), self._c(b), self._c(a))
+        self.color_object = self.drawing.make_color(self._c(r), self._c(g), self._c(b), self._c(a))
         return self
 
     def set_color_hex(self, _hex: str) -> typing.Self:
@@ -59,17 +52,13 @@ class Color(CharmyObject):
             r = int(hex_color[0:2], 16)
             g = int(hex_color[2:4], 16)
             b = int(hex_color[4:6], 16)
-            match self.frameworks.drawing_name:
-                case Drawing.SKIA:
-                    self.color_object = self.skia.ColorSetRGB(r, g, b)  # 返回不透明颜色
+            self.color_object = self.drawing.make_color(r, g, b)  # 返回不透明颜色
         elif len(hex_color) == 8:  # RGBA 格式(含 Alpha 通道)
             r = int(hex_color[0:2], 16)
             g = int(hex_color[2:4], 16)
             b = int(hex_color[4:6], 16)
             a = int(hex_color[6:8], 16)
-            match self.frameworks.drawing_name:
-                case Drawing.SKIA:
-                    self.color_object = self.skia.ColorSetARGB(a, r, g, b)  # 返回含透明度的颜色
+            self.color_object = self.drawing.make_color(r, g, b, a)  # 返回含透明度的颜色
         else:
             raise ValueError("HEX Should be #RRGGBB or #RRGGBBAA format")
         return self
@@ -84,12 +73,7 @@ class Color(CharmyObject):
         Raises:
             ValueError: When color not exists
         """
-        match self.frameworks.drawing_name:
-            case Drawing.SKIA:
-                try:
-                    self.color_object = getattr(self.skia, f"Color{name.upper()}")
-                except:
-                    raise ValueError(f"Unknown color name: {name}")
+        self.color_object = self.drawing.named_color(name)
         return self
 
     @staticmethod
@@ -1,3 +1,4 @@
+import asyncio
 import typing
 
 from .event import Event, EventHandling
@@ -14,7 +15,7 @@ class Var(EventHandling):
     def __init__(self, default_value=None, value_type: type | typing.Any = typing.Any):
         super().__init__()
 
-        self._value = (default_value if default_value is not None else value_type(),)
+        self._value = default_value if default_value is not None else value_type()
         self._value_type: type = value_type
 
     @property
@@ -31,6 +32,35 @@ class Var(EventHandling):
             else:
                 self.trigger(Event(self, "change", value=value))
 
+    async def wait_change(self) -> typing.Any:
+        """Wait until the value changes, from this thread or any other.
+
+        Example
+        -------
+        .. code-block:: python
+
+            async def watch(var):
+                while True:
+                    print("New value:", await var.wait_change())
+
+        Returns:
+            typing.Any: The new value.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def set_result(value):
+            if not future.done():
+                future.set_result(value)
+
+        task = self.bind(
+            "change", lambda event: loop.call_soon_threadsafe(set_result, event["value"])
+        )
+        try:
+            return await future
+        finally:
+            self.unbind(task)
+
 
 class StringVar(Var):
     """Only records values of type `str`."""
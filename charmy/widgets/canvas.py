@@ -18,13 +18,21 @@ class CanvasBase(CharmyObject):
         # e.g. [{"type": "rect", "id": "element0", "radius": 12}]
         self.elements: list[dict] = []
 
-        self.frameworks = self.cget("frameworks")  # The Framework
+        self.frameworks = self.attributes.frameworks  # The Framework
         self.color_object = None  # The color object to draw
 
+        # Display list recorded from `elements`, replayed on every draw until an element changes
+        self.picture = None
+        self.picture_record_count: int = 0  # How many times `elements` were recorded
+        self._elements_bounds: Rect | None = None  # Cached `elements_bounds()`, like `picture`
+        self._draw_bounds: tuple[Rect, Rect] | None = None  # Cached (rect, `draw_bounds()`)
+
         # 元素绘制映射表
         # TODO: 名字？难以理解感觉
         self.draw_type_map: dict[str, typing.Callable[[dict, dict], None]] = {
             "rect": self.draw_rect,
+            "rects": self.draw_rects,
+            "rect_array": self.draw_rect_array,
         }
 
     def draw_config(self, canvas):
@@ -32,8 +40,62 @@ class CanvasBase(CharmyObject):
         ...
 
     def draw(self, canvas):
-        """Draw the widget"""
+        """Draw the widget
+
+        The elements are recorded once into a display list, which is replayed until they change.
+        """
         self.draw_config(canvas)
+        self.draw_recorded(canvas)
+
+    def draw_recorded(self, canvas):
+        """Replay the recorded elements, recording them first if they changed
+
+        Unlike `draw()`, it does not call `draw_config()`.
+        """
+        if self.picture is None:
+            self.picture = self.frameworks.drawing.record(
+                self.elements_bounds(), self.draw_elements
+            )
+            self.picture_record_count += 1
+        self.frameworks.drawing.draw_picture(canvas, self.picture)
+
+    def invalidate_picture(self):
+        """Drop the recorded display list, so elements are recorded again on the next draw.
+
+        Call this after changing an element dict in place instead of with `config_element()`.
+        """
+        self.picture = None
+        self._elements_bounds = None
+        self._draw_bounds = None
+
+    def draw_bounds(self) -> Rect:
+        """Return the area drawn: the rect of the widget and the bounds of its elements."""
+        rect = getattr(self, "rect", Rect())
+        cached = self._draw_bounds
+        if cached is not None and cached[0] is rect:
+            return cached[1]
+        bounds = rect.union(self.elements_bounds()) if self.elements else rect
+        self._draw_bounds = (rect, bounds)
+        return bounds
+
+    def elements_bounds(self) -> Rect:
+        """Return the area covered by all elements."""
+        if self._elements_bounds is not None:
+            return self._elements_bounds
+        if not self.elements:
+            bounds = Rect()
+        else:
+            bounds = Rect.make_LTRB(
+                min(element["rect"].left for element in self.elements),
+                min(element["rect"].top for element in self.elements),
+                max(element["rect"].right for element in self.elements),
+                max(element["rect"].bottom for element in self.elements),
+            )
+        self._elements_bounds = bounds
+        return bounds
+
+    def draw_elements(self, canvas):
+        """Draw every element, by the drawing function of its type"""
         for element in self.elements:
             if element["type"] in self.draw_type_map:
                 self.draw_type_map[element["type"]](canvas, element)
@@ -46,8 +108,45 @@ class CanvasBase(CharmyObject):
             rect=element.get("rect"),
             radius=element.get("radius", 0),
             bg=element.get("bg", None),
+            bd=element.get("bd", None),
+            bd_width=element.get("bd_width", 1),
         )
 
+    def draw_rects(self, canvas, element: dict):
+        self.frameworks.drawing.draw_rects(canvas, element["batch"])
+
+    def draw_rect_array(self, canvas, element: dict):
+        # A `RectArray` triggers no change events, call `invalidate_picture()` after editing it
+        self.frameworks.drawing.draw_rect_array(
+            canvas,
+            element["rects"],
+            element.get("color", 0xFF000000),
+            anti_alias=element.get("anti_alias", False),
+        )
+
+    def dirty(self, rect: Rect | None = None) -> None:
+        """Report an area to be redrawn, implemented by widgets placed in a window."""
+        ...
+
+    def bounds_changed(self) -> None:
+        """Report that `draw_bounds()` changed, implemented by widgets in a container."""
+        ...
+
+    def _on_element_change(self, event):
+        """Handle the change of data shared by an element, e.g. a `RectBatch`."""
+        for element in self.elements:
+            if element.get("batch") is event.widget:
+                self.dirty(element["rect"])  # The area it leaves
+                element["rect"] = event.widget.bounds()
+                self.dirty(element["rect"])  # The area it covers now
+        self.invalidate_picture()
+        self.bounds_changed()
+
+    def _watch_element(self, element: dict):
+        """Follow changes of the element's batch, if it has one."""
+        if "batch" in element:
+            element["batch_task"] = element["batch"].bind("change", self._on_element_change)
+
     def _template(self, type_: str, rect: Rect, id_: ID = ID.AUTO, **kwargs):
         """Create a new element.
 
@@ -71,15 +170,26 @@ class CanvasBase(CharmyObject):
     def add_element(self, type_: str, rect: Rect, **kwargs):
         _ = self._template(type_, rect, **kwargs)
         self.elements.append(_)
+        self._watch_element(_)
+        self.invalidate_picture()
+        self.bounds_changed()
         return _["id"]
 
     def insert_element(self, index: int, type_: str, rect: Rect, **kwargs):
         _ = self._template(type_, rect, **kwargs)
         self.elements.insert(index, _)
+        self._watch_element(_)
+        self.invalidate_picture()
+        self.bounds_changed()
         return _["id"]
 
     def remove_element(self, index: int):
-        self.elements.pop(index)
+        element = self.elements.pop(index)
+        if "batch_task" in element:
+            element["batch"].unbind(element["batch_task"])
+        self.invalidate_picture()
+        self.dirty(element["rect"])
+        self.bounds_changed()
 
     def find_element(self, id_: ID) -> dict | None:
         for element in self.elements:
@@ -93,4 +203,13 @@ class CanvasBase(CharmyObject):
         element = self.find_element(id_)
         if element is None:
             raise ValueError(f"Not found element {id_}")
-        element.update(kwargs)
+        for key, value in kwargs.items():
+            # Only re-record when a property really changes, as `draw_config()` runs every frame
+            if key not in element or (element[key] is not value and element[key] != value):
+                if "rect" in kwargs:
+                    self.dirty(element["rect"])  # The area it leaves
+                element.update(kwargs)
+                self.invalidate_picture()
+                if "rect" in kwargs:
+                    self.bounds_changed()
+                break
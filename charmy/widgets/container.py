@@ -2,8 +2,10 @@ import functools
 import threading
 import typing
 
+from ..event import EventHandling
 from ..object import CharmyObject
 from ..rect import Rect
+from ..spatial import SpatialGrid
 
 
 class Container(CharmyObject):
@@ -14,7 +16,20 @@ class Container(CharmyObject):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.children = []
+        # Children in drawing order, as the keys of a dict so that looking one up or removing it
+        # takes O(1). `children` lists them
+        self._children: dict["CharmyObject", None] = {}
+        self._children_list: list["CharmyObject"] | None = []
+        self.spatial_index = SpatialGrid()  # Children by their rect, for hit-testing and culling
+        # Children drawing outside of their rect, by the area they draw, for culling only
+        self.overflow_index = SpatialGrid()
+
+    @property
+    def children(self) -> list["CharmyObject"]:
+        """The children, in drawing order. Use `add_child()` and `remove_child()` to change them."""
+        if self._children_list is None:  # Rebuilt once after any number of removals
+            self._children_list = list(self._children)
+        return self._children_list
 
     @property
     def rect(self):
@@ -56,14 +71,100 @@ class Container(CharmyObject):
 
     def add_child(self, child: "CharmyObject"):
         """Add a child object"""
-        if child not in self.children:
-            self.children.append(child)
-
-    def draw_children(self, canvas):
-        """Draw the container and its children"""
-        for child in self.children:
-            if hasattr(child, "draw"):
-                child.draw(canvas)
+        if child not in self._children:
+            self._children[child] = None
+            if self._children_list is not None:
+                self._children_list.append(child)
+            if hasattr(child, "rect"):
+                self.update_child_rect(child)
+            if isinstance(self, EventHandling) and getattr(child, "subtree_listener_mask", 0):
+                # Events routed to the child pass here
+                self.add_subtree_listener_mask(child.subtree_listener_mask)
+
+    def remove_child(self, child: "CharmyObject"):
+        """Remove a child object"""
+        if child in self._children:
+            del self._children[child]
+            self._children_list = None
+            self.spatial_index.remove(child)
+            self.overflow_index.remove(child)
+            if isinstance(self, EventHandling) and getattr(child, "subtree_listener_mask", 0):
+                self.update_subtree_listener_mask()
+
+    def update_child_rect(self, child: "CharmyObject"):
+        """Update the spatial index after the rect of a child, or the area it draws, changed"""
+        rect = child.rect
+        self.spatial_index.update(child, rect)
+        bounds = child.draw_bounds() if hasattr(child, "draw_bounds") else rect
+        if rect.contains_rect(bounds):
+            self.overflow_index.remove(child)
+        else:
+            self.overflow_index.update(child, bounds)
+
+    def child_at(self, x: int | float, y: int | float) -> typing.Optional["CharmyObject"]:
+        """Get the topmost child containing a point
+
+        Args:
+            x: The x position of the point
+            y: The y position of the point
+        """
+        return self.spatial_index.topmost_at(x, y)
+
+    def path_at(self, x: int | float, y: int | float) -> list["CharmyObject"]:
+        """Get the descendants containing a point, from the child down to the topmost leaf
+
+        Each level is a `child_at()` lookup, so the cost grows with the depth of the tree
+        rather than with the number of widgets.
+
+        Args:
+            x: The x position of the point
+            y: The y position of the point
+        """
+        path = []
+        node = self
+        while isinstance(node, Container):
+            node = node.child_at(x, y)
+            if node is None:
+                break
+            path.append(node)
+        return path
+
+    def children_in(self, rect: Rect) -> list["CharmyObject"]:
+        """Get the children overlapping a rect, in drawing order
+
+        Args:
+            rect (Rect): The area to query
+        """
+        return self.spatial_index.query_rect(rect)
+
+    def children_to_draw(self, rects: typing.Iterable[tuple] | None = None) -> list["CharmyObject"]:
+        """Get the children to draw, in drawing order
+
+        Args:
+            rects (Iterable[tuple], optional): Only get the children overlapping these areas,
+                given as (left, top, right, bottom), e.g. the damaged or visible area.
+                Defaults to None, all children.
+        """
+        if rects is None:
+            return [child for child in self.children if hasattr(child, "draw")]
+        found = set()
+        for left, top, right, bottom in rects:
+            found |= self.spatial_index.query_ltrb(left, top, right, bottom)
+            if self.overflow_index:
+                found |= self.overflow_index.query_ltrb(left, top, right, bottom)
+        return [child for child in self.spatial_index.in_order(found) if hasattr(child, "draw")]
+
+    def draw_children(self, canvas, rects: typing.Iterable[tuple] | None = None):
+        """Draw the container and its children
+
+        Args:
+            canvas: The canvas to draw on
+            rects (Iterable[tuple], optional): Only draw the children overlapping these areas,
+                given as (left, top, right, bottom), e.g. the damaged or visible area.
+                Defaults to None, all children.
+        """
+        for child in self.children_to_draw(rects):
+            child.draw(canvas)
 
     # endregion
 
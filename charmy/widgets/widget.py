@@ -4,6 +4,7 @@ from ..event import EventHandling
 from ..rect import Rect
 from .canvas import CanvasBase
 from .container import Container, auto_find_parent
+from .windowbase import WindowBase
 
 
 @auto_find_parent
@@ -43,16 +44,63 @@ class Widget(CanvasBase, EventHandling):
         """Return the height of the widget."""
         return self.rect.height
 
+    @property
+    def window(self) -> WindowBase | None:
+        """Return the window the widget belongs to."""
+        parent = self.parent
+        while parent is not None and not isinstance(parent, WindowBase):
+            parent = getattr(parent, "parent", None)
+        return parent
+
+    def dirty(self, rect: Rect | None = None) -> None:
+        """Report an area of the widget to be redrawn to its window.
+
+        Args:
+            rect (Rect, optional): The invalidated area. Defaults to None, the whole widget
+                and its elements, see `draw_bounds()`.
+        """
+        window = self.window
+        if window is not None:
+            window.dirty(self.draw_bounds() if rect is None else rect)
+
+    def bounds_changed(self) -> None:
+        """Update the spatial index of the parent, so the whole drawn area is redrawn."""
+        if isinstance(self.parent, Container) and self in self.parent.spatial_index:
+            self.parent.update_child_rect(self)
+
+    def destroy(self) -> None:
+        """Remove the widget from its parent and unbind its tasks, so it can be freed."""
+        self.dirty()  # The area it leaves
+        if isinstance(self.parent, Container):
+            self.parent.remove_child(self)
+        self.unbind_all()
+        self.parent = None
+
     def place(self, x, y, width, height) -> typing.Self:
         """Place the widget at the specified position and size.
 
         Place the widget at the specified position and size.
 
+        `Rect` is immutable, so elements added with ``rect=self.rect`` keep the old rect. Elements
+        whose rect equals the old widget rect are moved to the new one here; elements with rects
+        of their own must be updated by `draw_config()`.
+
         Args:
             x (int | float): The x position of the widget.
             y (int | float): The y position of the widget.
             width (int | float): The width of the widget.
             height (int | float): The height of the widget.
         """
-        self.rect.make_XYWH(x, y, width, height)
+        rect = Rect(x, y, width, height)
+        if rect == self.rect:
+            return self  # Keep the rect object the elements may share
+        self.dirty()  # The area it leaves
+        old_rect, self.rect = self.rect, rect
+        for element in self.elements:
+            if element.get("rect") == old_rect:
+                element["rect"] = rect
+                self.invalidate_picture()
+        if isinstance(self.parent, Container):
+            self.parent.update_child_rect(self)
+        self.dirty()  # The area it enters
         return self
@@ -1,5 +1,9 @@
+import math
+import time
+
 from ..const import Backends
 from ..rect import Rect
+from .canvas import CanvasBase
 from .container import Container
 from .windowbase import WindowBase
 
@@ -16,6 +20,43 @@ class Window(WindowBase, Container):
 
     # TODO: why specific drawing frame?
     def skia_draw_func(self, canvas):
-        """Draw function for Skia."""
+        """Draw function for Skia.
+
+        Only the damaged area of the window is redrawn: drawing is clipped to it and children
+        outside of it are skipped.
+        """
+        if self.damage_region.is_full:
+            canvas.clear(self.skia.ColorGRAY)
+            self._draw_children_timed(canvas, [(0, 0, self.size[0], self.size[1])])  # Visible
+            return
+
+        clip = self.skia.Region()
+        for left, top, right, bottom in self.damage_region.rects:
+            clip.op(
+                self.skia.IRect.MakeLTRB(
+                    math.floor(left), math.floor(top), math.ceil(right), math.ceil(bottom)
+                ),
+                self.skia.Region.kUnion_Op,
+            )
+        canvas.save()
+        canvas.clipRegion(clip)
         canvas.clear(self.skia.ColorGRAY)
-        self.draw_children(canvas)
+        self._draw_children_timed(canvas, self.damage_region.rects)
+        canvas.restore()
+
+    def _draw_children_timed(self, canvas, rects):
+        """Draw children like `draw_children()`, recording layout time in `frame_timings`."""
+        children = self.children_to_draw(rects)
+        # Only children keeping `CanvasBase.draw()` can be split into layout and recording,
+        # those overriding it draw themselves
+        is_split = [type(child).draw is CanvasBase.draw for child in children]
+        start = time.perf_counter()
+        for child, split in zip(children, is_split):
+            if split:
+                child.draw_config(canvas)
+        self.frame_timings.add("layout", time.perf_counter() - start)
+        for child, split in zip(children, is_split):
+            if split:
+                child.draw_recorded(canvas)
+            else:
+                child.draw(canvas)
@@ -1,11 +1,25 @@
+import array
+import time
 import typing
 
-from ..cmm import CharmyManager
-from ..const import MANAGER_ID, DrawingMode
-from ..event import Event, EventHandling
+from ..cmm import CharmyManager, get_manager
+from ..const import DrawingMode
+from ..event import (
+    Event,
+    EventHandling,
+    MouseEvent,
+    MoveEvent,
+    ResizeEvent,
+    TypedEvent,
+    event_bit,
+)
+from ..frameworks.drawing import SkiaGLRenderTarget, SkiaRasterRenderTarget
 from ..object import CharmyObject
 from ..pos import Pos
+from ..profiling import FrameTimings
+from ..rect import DamageRegion, Rect
 from ..size import Size
+from .container import Container
 
 
 class WindowBase(EventHandling, CharmyObject):
@@ -17,8 +31,12 @@ class WindowBase(EventHandling, CharmyObject):
         size: The size of the window,
         fha: Whether to force hardware acceleration
         drawing_mode: The drawing mode of the window,
+        coalesce_events: Whether to dispatch only the latest sample of the events in
+            `COALESCED_EVENTS` in each loop round, see `handle_event()`.
     """
 
+    COALESCED_EVENTS: tuple[str, ...] = ("mouse_move", "resize", "move")
+
     def __init__(
         self,
         parent: CharmyManager | None = None,
@@ -27,12 +45,13 @@ class WindowBase(EventHandling, CharmyObject):
         size: tuple[int, int] = (100, 100),
         fha: bool = True,
         drawing_mode: DrawingMode = DrawingMode.RETAINED,
+        coalesce_events: bool = False,
     ):
         super().__init__()
 
         # Init parent attribute
         if parent is None:
-            parent = self.get_obj(MANAGER_ID)
+            parent = get_manager()
 
         if isinstance(parent, CharmyManager):
             self.manager = parent
@@ -42,12 +61,18 @@ class WindowBase(EventHandling, CharmyObject):
 
         # Init Attributes
         self.ui_draw_func = None
-        self.frameworks = self.cget("frameworks")
+        self.frameworks = self.attributes.frameworks
         self.drawing_mode = drawing_mode
 
+        # The framework-specific steps of a frame are chosen here once, so `draw()` compares no
+        # framework names
         match self.frameworks.ui_name:
             case "GLFW":
                 self.glfw = self.frameworks.ui.glfw
+                # A surface needs a current GL context, GLFW clears it when a window is closed
+                self._needs_current_context: bool = True
+            case "HEADLESS":
+                self._needs_current_context: bool = False
             case _:
                 raise ValueError(f"Unknown UI Framework: {self.frameworks.ui_name}")
 
@@ -55,6 +80,7 @@ class WindowBase(EventHandling, CharmyObject):
             case "SKIA":
                 self.skia = self.frameworks.drawing.skia
                 self.drawing_surface = None
+                self._draw_frame: typing.Callable[[], None] = self._draw_skia
             case _:
                 raise ValueError(
                     f"Unknown Drawing Framework: {self.frameworks.drawing_name}"
@@ -65,6 +91,10 @@ class WindowBase(EventHandling, CharmyObject):
                 self.opengl = self.frameworks.backend.opengl
                 self.opengl_GL = self.frameworks.backend.opengl_GL
                 self.backend_context = None
+                self.render_target = SkiaGLRenderTarget(self.skia, self.opengl_GL)
+            case "RASTER":
+                self.backend_context = None
+                self.render_target = SkiaRasterRenderTarget(self.skia)
             case _:
                 raise ValueError(
                     f"Unknown Backend Framework: {self.frameworks.backend_name}"
@@ -76,7 +106,17 @@ class WindowBase(EventHandling, CharmyObject):
         self._size = (size[0], size[1])  # The size of the window
         self._title = title  # The title of the window
 
+        self.frame_timings = FrameTimings()  # How long each phase of the last frames took
+        self.coalesce_events: bool = coalesce_events
+        self.pending_events: dict[str, TypedEvent] = {}  # Latest sample of each coalesced type
+        self.mouse_samples = array.array("d")  # x, y of the coalesced mouse_move samples
+        # Widgets under the mouse, from a child of the window down to the topmost one, and
+        # those under it when a button was pressed. See `route_event()`
+        self.hover_path: list[EventHandling] = []
+        self.press_path: list[EventHandling] | None = None
         self.is_dirty: bool = True
+        self.damage_region = DamageRegion()  # Areas to redraw in RETAINED mode
+        self.damage_region.add_full()
         self.is_force_hardware_acceleration: bool = fha
         self.is_visible: bool = False  # Is the window visible
         self.is_alive: bool = False  # Is the window alive
@@ -98,25 +138,195 @@ class WindowBase(EventHandling, CharmyObject):
 
         _root_point = self.root_pos = (arg["pos"][0], arg["pos"][1])
 
+        # The swap interval belongs to the GL context, so it is set once for each window
+        self.frameworks.ui.make_context_current(arg["window"])
+        self.frameworks.ui.swap_interval(self.attributes.ui_is_vsync)
+        self.attributes.subscribe("ui.is_vsync", self._on_vsync_change)
+
         self.is_visible = True
         self.is_alive = True
 
         return arg["window"]
 
+    def _on_vsync_change(self, is_vsync: bool) -> None:
+        """Apply a new ``ui.is_vsync`` to the GL context of the window."""
+        if self.is_alive and self.the_window:
+            self.frameworks.ui.make_context_current(self.the_window)
+            self.frameworks.ui.swap_interval(is_vsync)
+
     def create_event_bounds(self):
         """Create event bounds."""
         self.frameworks.ui.create_event_bounds(the_window=self.the_window, window_class=self)
 
-    def update(self):
-        """Update the window. When is_dirty is True, draw the window."""
+    def handle_event(self, event: Event | TypedEvent) -> None:
+        """Handle an input event coming from the UI framework.
+
+        With `coalesce_events`, the events in `COALESCED_EVENTS` are held back and only the
+        latest one of each type is dispatched, by `flush_events()` once the loop has processed
+        the pending input, or before any other event to keep the order. The dispatched
+        ``mouse_move`` event carries all the positions it replaced in ``event["samples"]``, an
+        ``array.array("d")`` of x, y pairs, e.g. to draw a smooth stroke.
+
+        Args:
+            event (Event | TypedEvent): The event to dispatch.
+        """
+        start = time.perf_counter()
+        if self.coalesce_events:
+            if event.event_type in self.COALESCED_EVENTS:
+                self.pending_events[event.event_type] = event
+                if event.event_type == "mouse_move":
+                    self.mouse_samples.extend((event["x"], event["y"]))
+                self.frame_timings.add("dispatch", time.perf_counter() - start)
+                return
+            self._dispatch_pending_events()
+        self.route_event(event)
+        self.frame_timings.add("dispatch", time.perf_counter() - start)
+
+    def flush_events(self) -> None:
+        """Dispatch the events held back by `coalesce_events`, called in each loop round."""
+        if self.pending_events:
+            start = time.perf_counter()
+            self._dispatch_pending_events()
+            self.frame_timings.add("dispatch", time.perf_counter() - start)
+
+    def _dispatch_pending_events(self) -> None:
+        if not self.pending_events:
+            return
+        events = self.pending_events
+        self.pending_events = {}
+        for event_type, event in events.items():
+            if event_type == "mouse_move":
+                event["samples"] = self.mouse_samples
+                self.mouse_samples = array.array("d")
+            self.route_event(event)
+
+    # region Routing
+
+    def route_event(self, event: Event | TypedEvent) -> None:
+        """Route an input event through the widget tree.
+
+        Mouse events go to the topmost widget under the mouse, the target, found with
+        `Container.path_at()`. They run the tasks bound with ``capture=True`` from the window
+        down to the target, then the other tasks from the target back up to the window. Any
+        task can stop this with ``event.stop_propagation()``. Other events are triggered on the
+        window only.
+
+        The path under the mouse is kept in `hover_path`. On ``mouse_move``, the widgets
+        leaving it receive ``mouse_leave`` and those joining it ``mouse_enter``, found by
+        comparing the old and the new paths. A ``mouse_release`` over the widget the button
+        was pressed on is followed by a ``click``. All of this costs a lookup per level of the
+        tree, whatever the number of widgets.
+
+        Args:
+            event (Event | TypedEvent): The event to route.
+        """
+        match event.event_type:
+            case "mouse_move":
+                path = self._path_at(event)
+                self._update_hover_path(path, event)
+                self._dispatch_along(path, event)
+            case "mouse_press":
+                path = self.press_path = self._path_at(event)
+                self._dispatch_along(path, event)
+            case "mouse_release":
+                path = self._path_at(event)
+                self._dispatch_along(path, event)
+                self._click(path, event)
+            case "click" | "double_click":
+                self._dispatch_along(self._path_at(event), event)
+            case "mouse_leave":
+                self._update_hover_path([], event)
+                self.trigger(event)
+            case _:
+                self.trigger(event)
+
+    def _path_at(self, event: Event | TypedEvent) -> list[EventHandling]:
+        """Get the widgets under the position of a mouse event."""
+        x, y = event["x"], event["y"]
+        if x is None or y is None or not isinstance(self, Container):
+            return []
+        return [node for node in self.path_at(x, y) if isinstance(node, EventHandling)]
+
+    def _dispatch_along(self, path: list[EventHandling], event: Event | TypedEvent) -> None:
+        """Run the capture phase down a path from the window, then the bubble phase back up."""
+        bit = event_bit(event.event_type)
+        nodes = [self, *path]
+        event.widget = nodes[-1]
+        for node in nodes:
+            if node.listener_mask & bit:
+                event.current_widget = node
+                node.trigger_capture(event)
+                if event.is_propagation_stopped:
+                    return
+        for node in reversed(nodes):
+            if node.listener_mask & bit:
+                event.current_widget = node
+                node.trigger(event)
+                if event.is_propagation_stopped:
+                    return
+
+    def _update_hover_path(self, path: list[EventHandling], event: Event | TypedEvent) -> None:
+        """Send ``mouse_leave`` and ``mouse_enter`` to the widgets leaving and joining the path."""
+        old_path = self.hover_path
+        if path == old_path:
+            return
+        self.hover_path = path
+        common = 0
+        for old_node, node in zip(old_path, path):
+            if old_node is not node:
+                break
+            common += 1
+        leave_bit = event_bit("mouse_leave")
+        for node in reversed(old_path[common:]):  # The innermost leaves first
+            if node.listener_mask & leave_bit:
+                node.trigger(MouseEvent(node, "mouse_leave", x=event["x"], y=event["y"]))
+        enter_bit = event_bit("mouse_enter")
+        for node in path[common:]:
+            if node.listener_mask & enter_bit:
+                node.trigger(MouseEvent(node, "mouse_enter", x=event["x"], y=event["y"]))
+
+    def _click(self, path: list[EventHandling], event: Event | TypedEvent) -> None:
+        """Route a ``click`` after a release over the widget the button was pressed on."""
+        press_path, self.press_path = self.press_path, None
+        if press_path is None:
+            return
+        # The innermost widget both under the press and under the release
+        common = 0
+        for press_node, node in zip(press_path, path):
+            if press_node is not node:
+                break
+            common += 1
+        click = MouseEvent(
+            self,
+            "click",
+            x=event["x"],
+            y=event["y"],
+            canvas_x=event["canvas_x"],
+            canvas_y=event["canvas_y"],
+            button=event["button"],
+            mods=event["mods"],
+        )
+        self._dispatch_along(path[:common], click)
+
+    # endregion
+
+    def update(self) -> bool:
+        """Update the window. When is_dirty is True, draw the window.
+
+        Returns:
+            bool: Whether the window was drawn.
+        """
         if self.is_visible:
             match self.drawing_mode:
                 case DrawingMode.IMMEDIATE:
                     self.draw()
+                    return True
                 case DrawingMode.RETAINED:
                     if self.is_dirty:
                         self.draw()
                         self.is_dirty = False
+                        return True
+        return False
 
     import contextlib
 
@@ -124,60 +334,22 @@ class WindowBase(EventHandling, CharmyObject):
     def skia_surface(self, arg: typing.Any):
         """Create a Skia surface for the window.
 
-        :param arg: GLFW or SDL2 Window/Surface
+        :param arg: GLFW or headless Window
         :return: Skia Surface
         """
-        match self.cget("ui.framework.name"):
-            case "GLFW":
-                if not self.glfw.get_current_context() or self.glfw.window_should_close(arg):
-                    yield None
-                    return
+        if self.frameworks.ui.can_be_closed(arg) or (
+            self._needs_current_context and not self.glfw.get_current_context()
+        ):
+            yield None
+            return
+
+        # The context and surface are kept by the render target and only rebuilt when the
+        # framebuffer size changes
+        fb_width, fb_height = self.frameworks.ui.get_framebuffer_size(arg)
+        surface = self.render_target.get_surface(fb_width, fb_height)
+        self.backend_context = self.render_target.context
 
-                match self.cget("backend.framework.name"):
-                    case "OPENGL":
-                        match self.cget("drawing.framework.name"):
-                            case "SKIA":
-                                self.backend_context = self.skia.GrDirectContext.MakeGL()
-                                fb_width, fb_height = self.glfw.get_framebuffer_size(arg)
-                                backend_render_target = self.skia.GrBackendRenderTarget(
-                                    fb_width,
-                                    fb_height,
-                                    0,
-                                    0,
-                                    self.skia.GrGLFramebufferInfo(0, self.opengl_GL.GL_RGBA8),
-                                )
-                                surface = self.skia.Surface.MakeFromBackendRenderTarget(
-                                    self.backend_context,
-                                    backend_render_target,
-                                    self.skia.kBottomLeft_GrSurfaceOrigin,
-                                    self.skia.kRGBA_8888_ColorType,
-                                    self.skia.ColorSpace.MakeSRGB(),
-                                )
-                                self.backend_context.setResourceCacheLimit(16 * 1024 * 1024)
-
-                                if surface is None:
-                                    raise RuntimeError("Failed to create Skia surface")
-
-                                yield surface
-
-            case "SDL":
-                import ctypes
-
-                width, height = arg.w, arg.h
-                pixels_ptr = arg.pixels
-                pitch = arg.pitch
-
-                # SDL 像素包装成 buffer
-                buf_type = ctypes.c_uint8 * (pitch * height)
-                buf = buf_type.from_address(pixels_ptr)  # NOQA
-
-                imageinfo = self.skia.ImageInfo.MakeN32Premul(width, height)  # NOQA
-                surface = self.skia.Surface.MakeRasterDirect(imageinfo, buf, pitch)
-
-                if surface is None:
-                    raise RuntimeError("Failed to create Skia surface")
-
-                yield surface  # ⚠️ 必须用 yield，不要 return
+        yield surface
 
     def draw(self, event: Event | None = None) -> None:  # NOQA
         """Draw the window.
@@ -186,55 +358,90 @@ class WindowBase(EventHandling, CharmyObject):
             event (CEvent, optional): The event that triggered the draw. Defaults to None.
         """
         if self.is_visible:
-            # Set the current context for each arg
-            # 【为该窗口设置当前上下文】
-            match self.cget("ui.framework.name"):
-                case "GLFW":
-                    self.frameworks.ui.make_context_current(self.the_window)
-
-                    match self.cget("drawing.framework.name"):
-                        case "SKIA":
-                            # Create a Surface and hand it over to this arg.
-                            # 【创建Surface，交给该窗口】
-                            with self.skia_surface(self.the_window) as self.drawing_surface:  # NOQA
-                                if self.drawing_surface:
-                                    with self.drawing_surface as canvas:
-                                        # Determine and call the drawing function of this arg.
-                                        # 【判断并调用该窗口的绘制函数】
-                                        if self.ui_draw_func:
-                                            self.ui_draw_func(canvas)
-
-                                    self.drawing_surface.flushAndSubmit()
-                case "SDL":
-                    import sdl2  # NOQA
-
-                    surface = sdl2.SDL_GetWindowSurface(self.the_window).contents
-
-                    with self.skia_surface(surface) as self.drawing_surface:  # NOQA
-                        if self.drawing_surface:
-                            with self.drawing_surface as canvas:
-                                if self.ui_draw_func:
-                                    self.ui_draw_func(canvas)
-
-                    sdl2.SDL_UpdateWindowSurface(self.the_window)  # NOQA
+            self._draw_frame()
 
             if self.is_alive:
+                start = time.perf_counter()
                 self.frameworks.ui.swap_buffers(self.the_window)
+                self.frame_timings.add("swap", time.perf_counter() - start)
 
-        if self.backend_context:
-            self.backend_context.freeGpuResources()
-            self.backend_context.releaseResourcesAndAbandonContext()
         # for child in self.children:
         #    child.need_redraw = False
+        self.damage_region.clear()
         self.trigger(Event(self, "draw"))
 
-    def dirty(self):
-        """Set the dirty flag."""
-        self.is_dirty = True
+    def _draw_skia(self) -> None:
+        """Draw a frame of a GLFW or headless window with Skia."""
+        # Set the current context for each arg
+        # 【为该窗口设置当前上下文】
+        self.frameworks.ui.make_context_current(self.the_window)
+
+        # Create a Surface and hand it over to this arg.
+        # 【创建Surface，交给该窗口】
+        with self.skia_surface(self.the_window) as self.drawing_surface:  # NOQA
+            if self.drawing_surface:
+                with self.drawing_surface as canvas:
+                    # Determine and call the drawing function of this arg.
+                    # 【判断并调用该窗口的绘制函数】
+                    if self.ui_draw_func:
+                        start = time.perf_counter()
+                        if self.drawing_mode == DrawingMode.RETAINED:
+                            self._draw_retained(canvas)
+                        else:
+                            self.damage_region.add_full()
+                            self.ui_draw_func(canvas)
+                        # `ui_draw_func` adds the layout time by itself
+                        self.frame_timings.add(
+                            "draw",
+                            time.perf_counter() - start - self.frame_timings.current("layout"),
+                        )
+
+                start = time.perf_counter()
+                self.drawing_surface.flushAndSubmit()
+                self.frame_timings.add("flush", time.perf_counter() - start)
+
+    def _draw_retained(self, canvas) -> None:
+        """Redraw the damaged area into the backing surface, then copy it to the window.
+
+        Args:
+            canvas (skia.Canvas): The canvas of the window surface.
+        """
+        backing_surface, is_new = self.render_target.get_backing_surface()
+        if is_new:
+            # A new backing surface holds no previous frame
+            self.damage_region.add_full()
+        with backing_surface as backing_canvas:
+            self.ui_draw_func(backing_canvas)
+        canvas.drawImage(backing_surface.makeImageSnapshot(), 0, 0)
+
+    def snapshot(self):
+        """Return the last frame drawn as a `skia.Image`, e.g. to compare it in tests.
+
+        With the OPENGL backend, only frames drawn in RETAINED mode can be read back.
+
+        Returns:
+            skia.Image | None: The frame, or None if nothing was drawn yet.
+        """
+        return self.render_target.snapshot()
+
+    def dirty(self, rect: Rect | None = None):
+        """Set the dirty flag.
+
+        Args:
+            rect (Rect, optional): The area to redraw. Defaults to None, the whole window.
+        """
+        if rect is None:
+            self.damage_region.add_full()
+        else:
+            self.damage_region.add(rect)
+        if not self.is_dirty:
+            self.is_dirty = True
+            self.manager.wake()  # In case it is called from another thread
 
     def cancel_dirty(self):
         """Cancel the dirty flag."""
         self.is_dirty = False
+        self.damage_region.clear()
 
     def destroy(self) -> None:
         """Destroy the window.
@@ -244,13 +451,26 @@ class WindowBase(EventHandling, CharmyObject):
         # self._event_init = False
         # print(self.id)
         try:
+            if self.the_window:
+                # The GPU context belongs to this window's GL context
+                self.frameworks.ui.make_context_current(self.the_window)
+                self.render_target.release()
+                self.backend_context = None
             self.frameworks.ui.destroy(the_window=self.the_window)
         except TypeError:
             pass
         finally:
+            for child in list(getattr(self, "children", ())):
+                if hasattr(child, "destroy"):
+                    child.destroy()
             self.is_alive = False
             # self.draw_func = None
             self.the_window = None  # Clear the reference
+            self.unbind_all()
+            self.attributes.unsubscribe("ui.is_vsync", self._on_vsync_change)
+            self.hover_path = []
+            self.press_path = None
+            self.manager.destroy_window(self)  # The manager held the last reference
 
     def can_be_close(self, value: bool | None = None) -> typing.Self | bool:
         """Set whether the window can be closed.
@@ -265,19 +485,12 @@ class WindowBase(EventHandling, CharmyObject):
         :param value: Whether the window can be closed
         :return: None
         """
-        match self.cget("ui.framework.name"):
-            case "GLFW":
-                import glfw
-
-                if value is not None:
-                    glfw.set_window_should_close(self.the_window, value)
-                    return self
-                else:
-                    if self.the_window:
-                        return glfw.window_should_close(self.the_window)
-                    else:
-                        return False
-        return True
+        if value is not None:
+            self.frameworks.ui.set_should_close(self.the_window, value)
+            return self
+        if self.the_window:
+            return self.frameworks.ui.can_be_closed(self.the_window)
+        return False
 
     # region Property
     @property
@@ -334,22 +547,21 @@ class WindowBase(EventHandling, CharmyObject):
 
     # region Events
 
-    def _on_move(self, event: Event):
+    def _on_move(self, event: MoveEvent):
         """Handle the move event.
 
         Args:
-            event (Event): The move event.
+            event (MoveEvent): The move event.
         """
-        _root_point = self.root_pos
-        _root_point = (event["x_root"], event["y_root"])
+        self.root_pos = (event["x_root"], event["y_root"])
 
-    def _on_resize(self, event: Event):
+    def _on_resize(self, event: ResizeEvent):
         """Handle the resize event.
 
         Args:
-            event (Event): The resize event.
+            event (ResizeEvent): The resize event.
         """
-        self.size = (event["width"], event["height"])
+        self._size = (event["width"], event["height"])  # Already resized by the user
         self.dirty()
 
     # endregion
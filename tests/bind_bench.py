@@ -0,0 +1,47 @@
+"""Time binding, finding and unbinding 100k tasks on one widget.
+
+Run with ``CHARMY_UI_BACKEND=HEADLESS python tests/bind_bench.py`` on machines without a display.
+"""
+
+import random
+import time
+
+import charmy as cm
+
+COUNT = 100_000
+
+window = cm.Window(size=(300, 160))
+
+
+def handler(event):
+    pass
+
+
+start = time.perf_counter()
+tasks = [window.bind("mouse_move", handler) for _ in range(COUNT)]
+bind_time = time.perf_counter() - start
+
+start = time.perf_counter()
+for task in tasks:
+    window.find_task(task.id)
+find_time = time.perf_counter() - start
+
+random.seed(0)
+random.shuffle(tasks)
+start = time.perf_counter()
+for task in tasks[: COUNT // 2]:
+    window.unbind(task)
+for task in tasks[COUNT // 2 :]:
+    window.unbind(task.id)
+unbind_time = time.perf_counter() - start
+
+# Hover and focus handlers come and go all the time: bind and unbind one at a time
+start = time.perf_counter()
+for _ in range(COUNT):
+    window.unbind(window.bind("mouse_enter", handler))
+churn_time = time.perf_counter() - start
+
+print(
+    f"{COUNT} tasks: bind {bind_time:.2f} s, find_task {find_time:.2f} s, "
+    f"unbind in random order {unbind_time:.2f} s, bind + unbind {churn_time:.2f} s"
+)
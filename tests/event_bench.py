@@ -0,0 +1,55 @@
+"""Compare creating and dispatching one million mouse events as `Event` and `MouseEvent`.
+
+Run with ``CHARMY_UI_BACKEND=HEADLESS python tests/event_bench.py`` on machines without a display.
+"""
+
+import gc
+import time
+import tracemalloc
+
+import charmy as cm
+
+COUNT = 1_000_000
+RETAINED = 100_000
+
+window = cm.Window(size=(300, 160))
+window.bind("mouse_move", lambda event: event["x"])
+
+
+def create(event_class):
+    for i in range(COUNT):
+        event_class(window, "mouse_move", x=i, canvas_x=i, y=i, canvas_y=i)
+
+
+def dispatch(event_class):
+    for i in range(COUNT):
+        window.trigger(event_class(window, "mouse_move", x=i, canvas_x=i, y=i, canvas_y=i))
+
+
+def bytes_per_event(event_class):
+    gc.collect()
+    tracemalloc.start()
+    events = [
+        event_class(window, "mouse_move", x=i, canvas_x=i, y=i, canvas_y=i)
+        for i in range(RETAINED)
+    ]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del events
+    return size / RETAINED
+
+
+for event_class in (cm.Event, cm.MouseEvent):
+    start = time.perf_counter()
+    create(event_class)
+    create_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    dispatch(event_class)
+    dispatch_time = time.perf_counter() - start
+
+    print(
+        f"{event_class.__name__:>10}: create {create_time:.2f} s, "
+        f"create + trigger {dispatch_time:.2f} s, "
+        f"{bytes_per_event(event_class):.0f} bytes per retained event"
+    )
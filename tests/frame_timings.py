@@ -0,0 +1,19 @@
+import charmy as cm
+from charmy.const import DrawingMode
+
+window = cm.Window(size=(300, 160), drawing_mode=DrawingMode.RETAINED)
+manager = cm.get_manager()
+
+manager.update(wait=False)  # The first frame draws the window
+print(len(window.frame_timings))  # OUTPUT: 1
+
+# A wake-up drawing nothing, e.g. for a timer, is not a frame
+window.bind("delay[0]", lambda event: None)
+manager.update(wait=False)
+print(len(window.frame_timings))  # OUTPUT: 1
+assert len(window.frame_timings) == 1
+
+window.dirty()
+manager.update(wait=False)
+print(len(window.frame_timings))  # OUTPUT: 2
+assert len(window.frame_timings) == 2
@@ -0,0 +1,13 @@
+import charmy as cm
+
+window = cm.Window(size=(300, 160))
+
+widget = cm.Widget(window)
+widget.place(0, 0, 10, 10)
+widget.add_element("rect", rect=widget.rect, bg={})
+
+# Placing it at the same position keeps the rect shared with the element
+widget.place(0, 0, 10, 10)
+widget.place(50, 50, 10, 10)
+print(widget.elements[0]["rect"])  # OUTPUT: Rect(x=50, y=50, width=10, height=10)
+assert widget.elements[0]["rect"] == widget.rect